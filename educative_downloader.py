@@ -3,41 +3,55 @@ Educative Course Downloader with Advanced Authentication Handling
 Download entire Agentic System Design course as PDF with proper auth
 """
 
+from __future__ import annotations
+
 import os
+import asyncio
 from dotenv import load_dotenv
 load_dotenv()
 
 import sys
 import json
+import re
+import hashlib
+import functools
+import base64
 import time
+import tempfile
 import logging
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
-import pickle
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
 import threading
+import queue
+import multiprocessing
+from importlib.util import find_spec
+from typing import TYPE_CHECKING
 
-# Web scraping and automation
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-
-# PDF handling
-from PyPDF2 import PdfMerger
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+# Selenium, requests, bs4, pypdf and httpx are imported inside the functions
+# that use them, so `--help` and other browser-free paths start instantly
+if TYPE_CHECKING:
+    import httpx
+    import requests
+    from requests.adapters import HTTPAdapter
+    from selenium import webdriver
 
 # Optional: webdriver manager for automatic ChromeDriver
-try:
-    from webdriver_manager.chrome import ChromeDriverManager
-    WEBDRIVER_MANAGER_AVAILABLE = True
-except ImportError:
-    WEBDRIVER_MANAGER_AVAILABLE = False
+WEBDRIVER_MANAGER_AVAILABLE = find_spec("webdriver_manager") is not None
+
+# Optional: httpx for async HTTP/2 lesson fetching
+HTTPX_AVAILABLE = find_spec("httpx") is not None
+H2_AVAILABLE = find_spec("h2") is not None  # httpx[http2]; plain httpx falls back to HTTP/1.1
+
+# Optional: selectolax (lexbor) as a faster lesson HTML parser than BeautifulSoup
+SELECTOLAX_AVAILABLE = find_spec("selectolax") is not None
+
+# Optional: pikepdf (qpdf) to stitch merge batches without holding the whole course in memory
+PIKEPDF_AVAILABLE = find_spec("pikepdf") is not None
 
 # ==================== Configuration ====================
 
@@ -46,8 +60,10 @@ class Config:
     # Paths
     OUTPUT_DIR = Path("./educative_course")
     PDF_DIR = OUTPUT_DIR / "pdfs"
-    COOKIES_FILE = OUTPUT_DIR / "session_cookies.pkl"
+    COOKIES_FILE = OUTPUT_DIR / "session_cookies.json"
+    COOKIES_MAX_AGE = 7 * 24 * 3600  # Older saved sessions go straight to a fresh login
     LOG_FILE = OUTPUT_DIR / "download.log"
+    LOG_LISTENER = None  # Background QueueListener, set by setup_logger
     
     # Educative
     BASE_URL = "https://www.educative.io"
@@ -61,6 +77,7 @@ class Config:
     # Timeouts
     PAGE_LOAD_TIMEOUT = 15
     WAIT_TIMEOUT = 20
+    LESSON_READY_TIMEOUT = 8  # Max wait for a lesson body to render before moving on
     REQUEST_TIMEOUT = 30
     
     # Delays (be respectful to servers)
@@ -69,11 +86,21 @@ class Config:
     
     # Parallel processing
     MAX_WORKERS = 3  # Number of parallel downloads
+    USE_PROCESSES = False  # Render PDFs in separate Chrome processes instead of tabs
+    MERGE_BATCH_SIZE = 50  # Lesson PDFs per in-memory pypdf merge pass
     
     # Chrome options
-    HEADLESS = False  # Set to False to see browser for debugging
+    HEADLESS = os.getenv("EDUCATIVE_HEADLESS", "true").lower() != "false"  # EDUCATIVE_HEADLESS=false to see browser for debugging
     WINDOW_SIZE = "1920x1080"
     USER_DATA_DIR = OUTPUT_DIR / "chrome_profile"  # Persist session between runs
+    PDF_STREAM_CHUNK = 1 << 20  # Bytes per IO.read when streaming printToPDF output
+    DEBUG_SCREENSHOTS = False  # Save login page screenshots on the happy path (--debug)
+    
+    # Assets blocked via CDP while only HTML/text is needed (lifted for PDF rendering)
+    BLOCKED_ASSET_URLS = ['*.png', '*.jpg', '*.jpeg', '*.webp', '*.gif', '*.svg', '*.woff', '*.woff2', '*.mp4']
+    # Trackers and widgets never contribute to a lesson, so they stay blocked in every mode
+    BLOCKED_TRACKER_URLS = ['*googletagmanager*', '*google-analytics*', '*segment.io*', '*segment.com*',
+                            '*intercom*', '*hotjar*', '*doubleclick*']
     
     @classmethod
     def setup(cls):
@@ -88,7 +115,13 @@ def setup_logger(name):
     Config.setup()
     
     logger = logging.getLogger(name)
+    
+    # Already configured (e.g. module re-imported) - don't stack duplicate handlers
+    if logger.handlers:
+        return logger
+    
     logger.setLevel(logging.DEBUG)
+    logger.propagate = False  # Avoid a second emission through the root logger
     
     # File handler
     fh = logging.FileHandler(Config.LOG_FILE)
@@ -106,21 +139,79 @@ def setup_logger(name):
     fh.setFormatter(formatter)
     ch.setFormatter(formatter)
     
-    logger.addHandler(fh)
-    logger.addHandler(ch)
+    # Workers only enqueue records; a background listener does the file/console IO
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    Config.LOG_LISTENER = QueueListener(log_queue, fh, ch, respect_handler_level=True)
+    Config.LOG_LISTENER.start()
+    atexit.register(Config.LOG_LISTENER.stop)  # Flush pending records on exit
     
     return logger
 
 logger = setup_logger(__name__)
 
+# ==================== HTTP Session ====================
+
+# One connection pool shared by every worker thread's session
+_ADAPTER: Optional[HTTPAdapter] = None
+_auth_cookies: List[Dict] = []
+_auth_headers: Dict[str, str] = {}
+_thread_local = threading.local()
+_RETRY_STATUSES = (429, 500, 502, 503, 504)  # Rate limiting and transient server errors
+
+def build_http_session(driver: webdriver.Chrome) -> requests.Session:
+    """Capture the browser's auth cookies and set up the shared connection pool"""
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    global _ADAPTER
+    
+    _auth_cookies[:] = driver.get_cookies()
+    
+    # Match the browser user agent so the server treats both clients alike
+    _auth_headers['User-Agent'] = driver.execute_script('return navigator.userAgent')
+    
+    # Bounded pool: workers block for a free keep-alive connection instead of opening new sockets
+    _ADAPTER = HTTPAdapter(
+        pool_connections=Config.MAX_WORKERS,
+        pool_maxsize=Config.MAX_WORKERS,
+        pool_block=True,
+        max_retries=Retry(total=5, backoff_factor=0.3, status_forcelist=_RETRY_STATUSES)
+    )
+    _thread_local.__dict__.clear()
+    
+    logger.info(f"✓ HTTP session ready ({len(_auth_cookies)} cookies)")
+    return get_http_session()
+
+def get_http_session() -> Optional[requests.Session]:
+    """Return this thread's session (None until build_http_session has run)"""
+    if _ADAPTER is None:
+        return None
+    
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        import requests
+        session = requests.Session()
+        session.mount('https://', _ADAPTER)
+        for cookie in _auth_cookies:
+            session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
+        session.headers.update(_auth_headers)
+        _thread_local.session = session
+    return session
+
 # ==================== Authentication Handler ====================
 
+# Empty an input and fire the event framework-bound forms listen for
+_CLEAR_INPUT_JS = "arguments[0].value = ''; arguments[0].dispatchEvent(new Event('input', {bubbles: true}));"
+
 class AuthenticationHandler:
     """Manages authentication with Educative"""
     
     def __init__(self, driver: webdriver.Chrome):
+        from selenium.webdriver.support.ui import WebDriverWait
         self.driver = driver
         self.wait = WebDriverWait(driver, Config.WAIT_TIMEOUT)
+        self._auth_verified = False  # Set once a check passes, skips repeat navigations
+        self._last_cookie_hash: Optional[bytes] = None
     
     def load_cookies(self) -> bool:
         """Load saved session cookies"""
@@ -128,13 +219,19 @@ class AuthenticationHandler:
             logger.info("No saved cookies found")
             return False
         
+        # Skip the navigation and verification round-trips for a session that is surely stale
+        if time.time() - Config.COOKIES_FILE.stat().st_mtime > Config.COOKIES_MAX_AGE:
+            logger.info("Saved cookies are too old, need to re-authenticate")
+            return False
+        
         try:
             logger.info("Loading saved session cookies...")
+            # Cookies can only be added for the domain currently loaded
             self.driver.get(Config.BASE_URL)
-            time.sleep(1)
+            self.wait.until(lambda d: d.execute_script("return document.readyState") == "complete")
             
-            with open(Config.COOKIES_FILE, 'rb') as f:
-                cookies = pickle.load(f)
+            with open(Config.COOKIES_FILE, 'r', encoding='utf-8') as f:
+                cookies = json.load(f)
             
             for cookie in cookies:
                 try:
@@ -155,14 +252,29 @@ class AuthenticationHandler:
     def save_cookies(self):
         """Save session cookies for future use"""
         try:
+            cookies = sorted(self.driver.get_cookies(), key=lambda c: c['name'])
+            data = json.dumps(cookies, sort_keys=True).encode('utf-8')
+            
+            # Skip the write when nothing changed since the last save
+            cookie_hash = hashlib.blake2b(data).digest()
+            if cookie_hash == self._last_cookie_hash:
+                logger.debug("Session cookies unchanged, skipping save")
+                return
+            
             with open(Config.COOKIES_FILE, 'wb') as f:
-                pickle.dump(self.driver.get_cookies(), f)
+                f.write(data)
+            self._last_cookie_hash = cookie_hash
             logger.info(f"✓ Session cookies saved to {Config.COOKIES_FILE}")
         except Exception as e:
             logger.error(f"✗ Failed to save cookies: {e}")
     
     def is_authenticated(self) -> bool:
         """Check if user is authenticated by looking for logged_in cookie"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        if self._auth_verified:
+            return True
+        
         try:
             # Method 1: Check for logged_in cookie (most reliable)
             logger.info("Checking authentication via cookie...")
@@ -172,6 +284,7 @@ class AuthenticationHandler:
             
             if is_logged_in:
                 logger.info("✓ User is authenticated (cookie found)")
+                self._auth_verified = True
                 return True
             
             # Method 2: Try navigating to course and checking
@@ -192,6 +305,7 @@ class AuthenticationHandler:
                     EC.presence_of_element_located((By.CSS_SELECTOR, "[class*='lesson'], [class*='content'], [class*='course']"))
                 )
                 logger.info("✓ User is authenticated (course content visible)")
+                self._auth_verified = True
                 return True
             except:
                 logger.warning("⚠ Could not verify authentication")
@@ -203,6 +317,8 @@ class AuthenticationHandler:
     
     def login_with_google(self, email: str, password: str) -> bool:
         """Login using Google OAuth (Continue with Google)"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
         try:
             logger.info("Attempting login with Google...")
             
@@ -276,6 +392,8 @@ class AuthenticationHandler:
     
     def login_with_otp_support(self, email: str, password: str, otp_timeout: int = 30) -> bool:
         """Perform login with OTP/2FA support - fills email/password, waits for OTP"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
         try:
             logger.info("=" * 60)
             logger.info("Email/Password Login with OTP Support")
@@ -284,126 +402,62 @@ class AuthenticationHandler:
             # Navigate to login page
             logger.info("Navigating to login page...")
             self.driver.get(Config.LOGIN_URL)
-            time.sleep(3)
             
-            # Take screenshot for debugging
-            screenshot_path = Config.OUTPUT_DIR / "login_page.png"
-            self.driver.save_screenshot(str(screenshot_path))
-            logger.debug(f"Screenshot saved to {screenshot_path}")
+            # Take screenshot for debugging (--debug only)
+            if Config.DEBUG_SCREENSHOTS:
+                screenshot_path = Config.OUTPUT_DIR / "login_page.png"
+                self.driver.save_screenshot(str(screenshot_path))
+                logger.debug(f"Screenshot saved to {screenshot_path}")
             
-            # Find and fill email field - try multiple selectors
+            # Find email field - whichever candidate becomes clickable first
             logger.info("Entering email...")
-            email_field = None
-            email_selectors = [
-                (By.NAME, "email"),
-                (By.ID, "email"),
+            email_field = self._wait_for_any_clickable([
                 (By.CSS_SELECTOR, "input[type='email']"),
                 (By.CSS_SELECTOR, "input[name='email']"),
-                (By.XPATH, "//input[@type='email']"),
-                (By.XPATH, "//input[@name='email']"),
-                (By.XPATH, "//input[@placeholder='Email' or @placeholder='email']")
-            ]
-            
-            for by, selector in email_selectors:
-                try:
-                    email_field = self.wait.until(
-                        EC.element_to_be_clickable((by, selector))
-                    )
-                    logger.debug(f"Found email field using: {by}='{selector}'")
-                    break
-                except Exception as e:
-                    logger.debug(f"Selector {by}='{selector}' failed: {e}")
-                    continue
+                (By.CSS_SELECTOR, "input#email"),
+                (By.CSS_SELECTOR, "input[placeholder='email' i]"),
+            ])
             
-            if not email_field:
-                raise Exception("Could not find email input field with any selector")
-            
-            # Scroll to element and click to focus
+            # Scroll to element and click once it is interactable
             self.driver.execute_script("arguments[0].scrollIntoView(true);", email_field)
-            time.sleep(0.5)
-            email_field.click()
-            time.sleep(0.5)
+            self.wait.until(EC.element_to_be_clickable(email_field)).click()
             
-            # Clear and enter email
-            email_field.clear()
-            time.sleep(0.3)
+            # Clear (notifying the page's input listeners) and enter email
+            self.driver.execute_script(_CLEAR_INPUT_JS, email_field)
             email_field.send_keys(email)
-            time.sleep(1)
             
             logger.info(f"✓ Email entered: {email}")
             
-            # Find and fill password field - try multiple selectors
+            # Find password field
             logger.info("Entering password...")
-            password_field = None
-            password_selectors = [
-                (By.NAME, "password"),
-                (By.ID, "password"),
+            password_field = self._wait_for_any_clickable([
                 (By.CSS_SELECTOR, "input[type='password']"),
                 (By.CSS_SELECTOR, "input[name='password']"),
-                (By.XPATH, "//input[@type='password']"),
-                (By.XPATH, "//input[@name='password']"),
-                (By.XPATH, "//input[@placeholder='Password' or @placeholder='password']")
-            ]
-            
-            for by, selector in password_selectors:
-                try:
-                    password_field = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((by, selector))
-                    )
-                    logger.debug(f"Found password field using: {by}='{selector}'")
-                    break
-                except Exception as e:
-                    logger.debug(f"Selector {by}='{selector}' failed: {e}")
-                    continue
+                (By.CSS_SELECTOR, "input#password"),
+                (By.CSS_SELECTOR, "input[placeholder='password' i]"),
+            ])
             
-            if not password_field:
-                raise Exception("Could not find password input field with any selector")
-            
-            # Scroll to element and click to focus
+            # Scroll to element and click once it is interactable
             self.driver.execute_script("arguments[0].scrollIntoView(true);", password_field)
-            time.sleep(0.5)
-            password_field.click()
-            time.sleep(0.5)
+            self.wait.until(EC.element_to_be_clickable(password_field)).click()
             
-            # Clear and enter password
-            password_field.clear()
-            time.sleep(0.3)
+            # Clear (notifying the page's input listeners) and enter password
+            self.driver.execute_script(_CLEAR_INPUT_JS, password_field)
             password_field.send_keys(password)
-            time.sleep(1)
             
             logger.info("✓ Password entered successfully")
             
-            # Click login button - try multiple selectors
+            # Find login button
             logger.info("Clicking login button...")
-            login_button = None
-            login_selectors = [
-                (By.XPATH, "//button[@type='submit']"),
-                (By.XPATH, "//button[contains(text(), 'Log In') or contains(text(), 'Login')]"),
-                (By.XPATH, "//button[contains(., 'Log In') or contains(., 'Login')]"),
+            login_button = self._wait_for_any_clickable([
                 (By.CSS_SELECTOR, "button[type='submit']"),
-                (By.XPATH, "//input[@type='submit']"),
-                (By.XPATH, "//button[contains(@class, 'login')]"),
-                (By.XPATH, "//button[contains(@class, 'submit')]")
-            ]
-            
-            for by, selector in login_selectors:
-                try:
-                    login_button = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((by, selector))
-                    )
-                    logger.debug(f"Found login button using: {by}='{selector}'")
-                    break
-                except Exception as e:
-                    logger.debug(f"Selector {by}='{selector}' failed: {e}")
-                    continue
-            
-            if not login_button:
-                raise Exception("Could not find login button with any selector")
+                (By.CSS_SELECTOR, "input[type='submit']"),
+                (By.XPATH, "//button[contains(., 'Log In') or contains(., 'Login')]"),
+            ])
             
             # Scroll to button and click
             self.driver.execute_script("arguments[0].scrollIntoView(true);", login_button)
-            time.sleep(0.5)
-            login_button.click()
+            self.wait.until(EC.element_to_be_clickable(login_button)).click()
             
             logger.info("✓ Login button clicked")
             logger.info("")
@@ -418,36 +472,18 @@ class AuthenticationHandler:
             logger.info("💡 The script will auto-detect when you're logged in")
             logger.info("=" * 60)
             
-            # Wait for OTP completion and authentication
-            start_time = time.time()
-            check_interval = 3  # Check every 3 seconds
-            
-            while time.time() - start_time < otp_timeout:
-                # Check if authenticated via cookie
-                try:
-                    is_logged_in = bool(self.driver.execute_script(
-                        '''return document.cookie.includes('logged_in')'''
-                    ))
-                    
-                    if is_logged_in:
-                        logger.info("")
-                        logger.info("=" * 60)
-                        logger.info("✓ OTP verification successful! You're now logged in")
-                        logger.info("=" * 60)
-                        self.save_cookies()
-                        time.sleep(1)
-                        return True
-                except Exception as e:
-                    logger.debug(f"Cookie check error: {e}")
-                
-                # Show countdown
-                time.sleep(check_interval)
-                remaining = int(otp_timeout - (time.time() - start_time))
-                if remaining % 15 == 0 and remaining > 0:  # Every 15 seconds
-                    logger.info(f"⏱️  Waiting for OTP verification... {remaining}s remaining")
+            # Wait for OTP completion - returns as soon as the login cookie appears
+            if not self._wait_for_login_cookie(otp_timeout, "OTP verification"):
+                logger.error("✗ OTP verification timeout")
+                return False
             
-            logger.error("✗ OTP verification timeout")
-            return False
+            logger.info("")
+            logger.info("=" * 60)
+            logger.info("✓ OTP verification successful! You're now logged in")
+            logger.info("=" * 60)
+            self._auth_verified = True
+            self.save_cookies()
+            return True
                 
         except Exception as e:
             logger.error(f"✗ Login error: {e}")
@@ -460,6 +496,36 @@ class AuthenticationHandler:
                 pass
             return False
     
+    def _wait_for_any_clickable(self, locators: List[tuple]):
+        """Wait in a single poll loop for whichever locator becomes clickable first"""
+        from selenium.webdriver.support import expected_conditions as EC
+        return self.wait.until(EC.any_of(*[EC.element_to_be_clickable(loc) for loc in locators]))
+    
+    def _wait_for_login_cookie(self, timeout: int, waiting_for: str) -> bool:
+        """Poll for the logged_in cookie, backing off from 1s up to 5s between checks"""
+        deadline = time.monotonic() + timeout
+        next_report = timeout - 15
+        delay = 1.0
+        
+        while True:
+            try:
+                if self.driver.execute_script("return document.cookie.includes('logged_in')"):
+                    return True
+            except Exception as e:
+                logger.debug(f"Cookie check error: {e}")
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            
+            # Show countdown every 15 seconds
+            if remaining <= next_report:
+                logger.info(f"⏱️  Waiting for {waiting_for}... {int(remaining)}s remaining")
+                next_report -= 15
+            
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, 5.0)
+    
     def manual_login(self, timeout: int = 180) -> bool:
         """Allow user to manually login in the browser (RECOMMENDED METHOD)"""
         try:
@@ -482,57 +548,47 @@ class AuthenticationHandler:
             
             # Navigate to Educative explore page
             self.driver.get("https://www.educative.io/explore")
-            time.sleep(3)
             
             # Wait for user to complete login
-            start_time = time.time()
-            check_interval = 3  # Check every 3 seconds
-            
-            while time.time() - start_time < timeout:
-                # Check if authenticated via cookie
-                try:
-                    is_logged_in = bool(self.driver.execute_script(
-                        '''return document.cookie.includes('logged_in')'''
-                    ))
-                    
-                    if is_logged_in:
-                        logger.info("")
-                        logger.info("=" * 60)
-                        logger.info("✓ Login detected! You're now authenticated")
-                        logger.info("=" * 60)
-                        self.save_cookies()
-                        time.sleep(1)
-                        return True
-                except Exception as e:
-                    logger.debug(f"Cookie check error: {e}")
-                
-                # Show countdown
-                time.sleep(check_interval)
-                remaining = int(timeout - (time.time() - start_time))
-                if remaining % 15 == 0 and remaining > 0:  # Every 15 seconds
-                    logger.info(f"⏱️  Waiting for login... {remaining}s remaining")
+            if not self._wait_for_login_cookie(timeout, "login"):
+                logger.error("✗ Login timeout - please try again")
+                return False
             
-            logger.error("✗ Login timeout - please try again")
-            return False
+            logger.info("")
+            logger.info("=" * 60)
+            logger.info("✓ Login detected! You're now authenticated")
+            logger.info("=" * 60)
+            self._auth_verified = True
+            self.save_cookies()
+            return True
             
         except Exception as e:
             logger.error(f"✗ Manual login error: {e}")
             return False
     
-    def authenticate(self, email: Optional[str] = None, password: Optional[str] = None, use_google: bool = False, manual: bool = False) -> bool:
+    def restore_session(self) -> bool:
+        """Log in from the saved session cookies, if they are still valid"""
+        if self.load_cookies():
+            # Already on the site - reload so the page picks up the restored session
+            self.driver.refresh()
+            if self.is_authenticated():
+                logger.info("✓ Using saved session - already authenticated!")
+                # Persist any cookies the server rotated so the next run can reuse them too
+                self.save_cookies()
+                return True
+            logger.info("Saved cookies expired, need to re-authenticate")
+        return False
+    
+    def authenticate(self, email: Optional[str] = None, password: Optional[str] = None, use_google: bool = False,
+                     manual: bool = False, try_saved: bool = True) -> bool:
         """Main authentication flow - Auto-fills credentials from .env, waits for OTP"""
         logger.info("=" * 60)
         logger.info("Starting Authentication")
         logger.info("=" * 60)
         
         # Try loading saved cookies first (from previous session)
-        if self.load_cookies():
-            self.driver.get("https://www.educative.io/explore")
-            time.sleep(2)
-            if self.is_authenticated():
-                logger.info("✓ Using saved session - already authenticated!")
-                return True
-            logger.info("Saved cookies expired, need to re-authenticate")
+        if try_saved and self.restore_session():
+            return True
         
         # Manual login mode - completely manual
         if manual:
@@ -569,14 +625,29 @@ class AuthenticationHandler:
 class ChromeDriverSetup:
     """Handles Chrome WebDriver configuration"""
     
+    _driver_path: Optional[str] = None  # Resolved once per process
+    
+    @classmethod
+    def _get_driver_path(cls) -> str:
+        """Resolve the ChromeDriver binary once; install() probes versions on every call"""
+        if cls._driver_path is None:
+            from webdriver_manager.chrome import ChromeDriverManager
+            cls._driver_path = ChromeDriverManager().install()
+        return cls._driver_path
+    
     @staticmethod
-    def get_driver() -> webdriver.Chrome:
+    def get_driver(persist_profile: bool = True, text_only: bool = False) -> webdriver.Chrome:
         """Create and configure Chrome WebDriver with optimized settings for speed"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         logger.info("Initializing Chrome WebDriver...")
         
         chrome_options = Options()
         
-        if Config.HEADLESS:
+        # CI machines have no display, so always run headless there
+        if Config.HEADLESS or os.getenv("CI"):
             chrome_options.add_argument('--headless=new')
             logger.info("Running in headless mode")
         
@@ -590,16 +661,22 @@ class ChromeDriverSetup:
         # Performance optimizations for faster page loads
         chrome_options.add_argument('--disable-extensions')
         chrome_options.add_argument('--disable-plugins')
-        chrome_options.add_argument('--disable-images')  # Don't load images (faster, but loses images in PDF)
-        chrome_options.add_argument('--blink-settings=imagesEnabled=true')  # Re-enable for PDF quality
         chrome_options.add_argument('--disk-cache-size=0')  # Disable disk cache
         chrome_options.add_argument('--aggressive-cache-discard')
+        chrome_options.add_argument('--disable-background-networking')
+        chrome_options.add_argument('--disable-features=TranslateUI,MediaRouter')
+        
+        # Text-only runs never print, so images need not even be decoded
+        if text_only:
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
         
         # User data directory for session persistence (KEY FEATURE!)
-        user_data_dir = str(Config.USER_DATA_DIR.absolute())
-        Config.USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
-        chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
-        logger.info(f"Using profile directory: {user_data_dir}")
+        # Worker processes skip it: Chrome locks a profile to a single instance
+        if persist_profile:
+            user_data_dir = str(Config.USER_DATA_DIR.absolute())
+            Config.USER_DATA_DIR.mkdir(parents=True, exist_ok=True)
+            chrome_options.add_argument(f'--user-data-dir={user_data_dir}')
+            logger.info(f"Using profile directory: {user_data_dir}")
         
         # User agent to avoid detection
         chrome_options.add_argument(
@@ -616,7 +693,7 @@ class ChromeDriverSetup:
         
         # Preferences for faster loads
         prefs = {
-            'profile.managed_default_content_settings.images': 1,  # Allow images
+            'profile.managed_default_content_settings.images': 2 if text_only else 1,  # Images only for PDFs
             'profile.default_content_setting_values.notifications': 2,  # Block notifications
             'profile.managed_default_content_settings.stylesheets': 1,  # Allow CSS
             'profile.managed_default_content_settings.javascript': 1,  # Allow JS
@@ -626,15 +703,24 @@ class ChromeDriverSetup:
         # Get ChromeDriver
         if WEBDRIVER_MANAGER_AVAILABLE:
             logger.info("Using webdriver-manager for ChromeDriver")
-            service = Service(ChromeDriverManager().install())
+            service = Service(ChromeDriverSetup._get_driver_path())
             driver = webdriver.Chrome(service=service, options=chrome_options)
         else:
             logger.info("Using system ChromeDriver")
             driver = webdriver.Chrome(options=chrome_options)
         
+        # Let tab workers and CDP calls share chromedriver without queueing on one socket
+        pool_manager = driver.command_executor._conn
+        pool_manager.connection_pool_kw['maxsize'] = max(Config.MAX_WORKERS * 2, 10)
+        pool_manager.clear()
+        
         # Reduced page load timeout for faster failures
         driver.set_page_load_timeout(15)  # Reduced from 30s to 15s
         
+        # Skip images/fonts during login and text extraction; PDF download lifts this
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': Config.BLOCKED_ASSET_URLS + Config.BLOCKED_TRACKER_URLS})
+        
         # Enable CDP commands for PDF generation
         driver.command_executor._commands["send_command"] = ("POST", '/session/$sessionId/chromium/send_command')
         
@@ -645,6 +731,79 @@ class ChromeDriverSetup:
 
 # ==================== Lesson Downloader ====================
 
+# Single-round-trip readiness check: returns {title} once the lesson body has rendered.
+# window.__navigating is set before a non-blocking navigation and vanishes with the old page.
+_LESSON_READY_JS = """
+if (window.__navigating || document.readyState !== 'complete') return null;
+const h = document.querySelector('h1');
+const body = document.querySelector('.lesson-content, article, main');
+return h && body && body.innerText.length > 50 ? {title: h.innerText} : null;
+"""
+
+_FN_SANITIZE = re.compile(r'[^\w \-]')
+
+@functools.lru_cache(maxsize=512)
+def _sanitize(title: str) -> str:
+    """Filename-safe form of a lesson title (first 50 chars, spaces as underscores)"""
+    return _FN_SANITIZE.sub('', title[:50]).strip().replace(' ', '_')
+
+# A real lesson has an h1 and one of these containers with text (checked by _LESSON_READY_JS
+# in the browser, and on served HTML so an app shell is never accepted as a lesson)
+_LESSON_BODY_SELECTOR = '.lesson-content, article, main'
+
+# Lesson containers in order of preference, shared by the HTTP and rendered paths
+_CONTENT_SELECTORS = ['.lesson-content', "[class*='lesson']", "[class*='content']", 'article', 'main', 'body']
+
+# Lesson title and text from the first matching container (selectors passed in priority order),
+# plus a paragraph/list-item fallback
+_EXTRACT_LESSON_JS = """
+// Selectors are tried one by one; a combined list would always match <body> first
+let c = null;
+for (const sel of arguments[0]) {
+    c = document.querySelector(sel);
+    if (c) break;
+}
+const h = document.querySelector('h1') || document.querySelector('[class*=title]');
+const text = c ? c.innerText : '';
+return {
+    title: h ? h.innerText : '',
+    text: text,
+    paragraphs: text.trim().length < 50
+        // List items count too, unless their text already comes from a nested <p>
+        ? [...document.querySelectorAll('p, li:not(:has(p))')].map(e => e.innerText).filter(t => t.trim()).join('\\n\\n')
+        : ''
+};
+"""
+
+# Optimized PDF settings for faster generation and better quality (same for every lesson)
+_PRINT_OPTIONS = {
+    'paperWidth': 8.5,  # Letter width in inches
+    'paperHeight': 11,  # Letter height in inches
+    'printBackground': True,  # Include backgrounds and colors
+    'marginTop': 0.4,
+    'marginBottom': 0.4,
+    'marginLeft': 0.4,
+    'marginRight': 0.4,
+    'scale': 0.95,  # Slightly smaller to fit more content
+    'preferCSSPageSize': False,
+    'displayHeaderFooter': False,  # Faster without headers/footers
+    'transferMode': 'ReturnAsStream',  # Read back in chunks via IO.read
+}
+
+def _write_pdf(data: str, filepath: Path):
+    """Decode a Page.printToPDF payload to disk"""
+    with open(filepath, 'wb') as f:
+        f.write(base64.b64decode(data))
+
+# All course link hrefs, or null until at least one lesson link of the given course exists
+_COURSE_LINKS_JS = """
+const hrefs = Array.from(document.querySelectorAll("a[href*='/courses/']")).map(a => a.href);
+return hrefs.some(h => h.startsWith(arguments[0])) ? hrefs : null;
+"""
+
+# Links that are never lessons (profile, login, signup pages and in-page anchors)
+_SKIP_RE = re.compile(r'/(?:profile|login|signup)|#')
+
 class LessonDownloader:
     """Downloads individual lessons as PDFs"""
     
@@ -655,10 +814,46 @@ class LessonDownloader:
             driver: Selenium WebDriver instance
             course_url: Main course URL (e.g., https://www.educative.io/courses/agentic-ai-systems)
         """
+        from selenium.webdriver.support.ui import WebDriverWait
         self.driver = driver
         self.wait = WebDriverWait(driver, Config.WAIT_TIMEOUT)
+        # Built once: the readiness wait runs for every lesson
+        self._ready_wait = WebDriverWait(driver, Config.LESSON_READY_TIMEOUT, poll_frequency=0.1)
+        self._toc_wait = WebDriverWait(driver, Config.WAIT_TIMEOUT, poll_frequency=0.2)
         self.course_url = course_url
+        self._course_base = (course_url or '').rstrip('/')
+        self._course_base_slash = self._course_base + '/'
         self.lesson_urls = []
+        self._driver_lock = threading.Lock()  # Selenium sessions are not reentrant
+        self._tab_handles: queue.Queue = queue.Queue()
+        self._io_executor: Optional[ThreadPoolExecutor] = None  # Set while PDFs are being written
+        self._pending_writes: Dict[Path, Future] = {}
+        self._assets_blocked = True  # Matches the blocklist installed by ChromeDriverSetup
+    
+    def _wait_for_lesson_ready(self) -> Optional[str]:
+        """Poll until the lesson content has rendered and return its title; None on timeout"""
+        try:
+            ready = self._ready_wait.until(lambda d: d.execute_script(_LESSON_READY_JS))
+            return ready['title']
+        except Exception:
+            return None
+    
+    def _set_assets_blocked(self, blocked: bool):
+        """Toggle CDP blocking of images/fonts (blocked from driver setup onwards)"""
+        self._assets_blocked = blocked
+        self._apply_blocked_urls()
+    
+    def _apply_blocked_urls(self):
+        """Install the current blocklist in the active tab (CDP blocking is per tab)"""
+        urls = Config.BLOCKED_TRACKER_URLS + (Config.BLOCKED_ASSET_URLS if self._assets_blocked else [])
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': urls})
+    
+    def _open_tab(self) -> str:
+        """Open a worker tab with the same request blocking as the main one; returns its handle"""
+        self.driver.switch_to.new_window('tab')
+        self._apply_blocked_urls()
+        return self.driver.current_window_handle
     
     def extract_lesson_urls_from_course(self) -> List[str]:
         """
@@ -673,52 +868,29 @@ class LessonDownloader:
             logger.info(f"Extracting lesson URLs from: {self.course_url}")
             self.driver.get(self.course_url)
             
-            # Wait for page to load
-            time.sleep(2)
-            
-            # Try multiple selectors for lesson links
-            lesson_links = []
-            
-            # Method 1: Look for links in table of contents / sidebar
-            selectors_to_try = [
-                "a[href*='/courses/'][href*='/']",  # Course lesson links
-                ".toc a[href*='/courses/']",  # Table of contents links
-                "[class*='lesson'] a[href*='/courses/']",  # Lesson container links
-                "[class*='curriculum'] a[href*='/courses/']",  # Curriculum links
-                "nav a[href*='/courses/']",  # Navigation links
-            ]
-            
-            for selector in selectors_to_try:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        logger.info(f"Found {len(elements)} links using selector: {selector}")
-                        for elem in elements:
-                            href = elem.get_attribute('href')
-                            if href and '/courses/' in href and href not in lesson_links:
-                                # Filter out non-lesson links (home, profile, etc.)
-                                if not any(x in href for x in ['/profile', '/login', '/signup', '#']):
-                                    lesson_links.append(href)
-                        if lesson_links:
-                            break
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_lessons = []
-            for url in lesson_links:
-                if url not in seen:
-                    seen.add(url)
-                    unique_lessons.append(url)
-            
-            # Filter to only include lesson pages (not main course page)
-            course_base = self.course_url.rstrip('/')
-            filtered_lessons = [
-                url for url in unique_lessons 
-                if url.startswith(course_base) and url != course_base and url != course_base + '/'
-            ]
+            # Collect every course link href in a single round trip per poll
+            # (the table of contents, sidebar and nav links all match this selector),
+            # returning as soon as the table of contents has rendered lesson links
+            try:
+                hrefs = self._toc_wait.until(
+                    lambda d: d.execute_script(_COURSE_LINKS_JS, self._course_base_slash)
+                )
+            except Exception:
+                logger.warning("No lesson links rendered before timeout")
+                hrefs = []
+            logger.info(f"Found {len(hrefs)} course links")
+            
+            # Filter and de-duplicate in one pass (dict keeps first-seen order):
+            # only lesson pages under this course, not the course page itself,
+            # and no non-lesson links (profile, login, etc.)
+            filtered_lessons = list(dict.fromkeys(
+                href for href in hrefs
+                if href
+                and href.startswith(self._course_base)
+                and href != self._course_base
+                and href != self._course_base_slash
+                and not _SKIP_RE.search(href)
+            ))
             
             logger.info(f"✓ Extracted {len(filtered_lessons)} lesson URLs")
             self.lesson_urls = filtered_lessons
@@ -729,65 +901,145 @@ class LessonDownloader:
             return []
     
     def extract_lesson_content(self, url: str) -> Optional[str]:
-        """Extract text content from a lesson page"""
+        """Extract text content from a lesson page (HTTP first, browser as fallback)"""
+        session = get_http_session()
+        if session is not None:
+            content = self._fetch_lesson_content(session, url)
+            if content:
+                return content
+            logger.debug(f"HTTP fetch gave no usable content, rendering in browser: {url}")
+        
+        # The driver is shared by all workers and is not thread-safe
+        with self._driver_lock:
+            return self._render_lesson_content(url)
+    
+    def _fetch_lesson_content(self, session: requests.Session, url: str) -> Optional[str]:
+        """Fetch lesson HTML over the pooled HTTP session and extract its text"""
+        try:
+            logger.info(f"Fetching lesson: {url}")
+            response = session.get(url, timeout=Config.REQUEST_TIMEOUT)
+            response.raise_for_status()
+            return self._parse_lesson_html(response.text, url)
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return None
+    
+    async def _fetch_lesson_content_async(self, client: "httpx.AsyncClient", url: str,
+                                          fetches: asyncio.Semaphore) -> Optional[str]:
+        """Fetch lesson HTML on the shared async client and extract its text"""
+        try:
+            logger.info(f"Fetching lesson: {url}")
+            # Same policy as the requests path: retry 429/5xx with exponential backoff
+            for attempt in range(6):
+                async with fetches:
+                    response = await client.get(url)
+                if response.status_code not in _RETRY_STATUSES or attempt == 5:
+                    break
+                retry_after = response.headers.get('Retry-After', '')
+                delay = min(float(retry_after), 30) if retry_after.isdigit() else 0.3 * 2 ** attempt
+                logger.debug(f"HTTP {response.status_code} for {url}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            response.raise_for_status()
+            return self._parse_lesson_html(response.text, url)
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return None
+    
+    async def _fetch_all_lessons_async(self) -> List[Optional[str]]:
+        """Fetch every lesson concurrently over one HTTP/2 connection pool"""
+        import httpx
+        
+        cookies = httpx.Cookies()
+        for cookie in _auth_cookies:
+            cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''))
+        
+        # Fetches are far cheaper than browser renders, but stay proportional to MAX_WORKERS
+        # so a larger course doesn't burst into the rate limiter
+        fetches = asyncio.Semaphore(Config.MAX_WORKERS * 4)
+        limits = httpx.Limits(max_connections=Config.MAX_WORKERS * 4, max_keepalive_connections=Config.MAX_WORKERS * 4)
+        async with httpx.AsyncClient(
+            http2=H2_AVAILABLE,
+            limits=limits,
+            cookies=cookies,
+            headers=_auth_headers,
+            timeout=Config.REQUEST_TIMEOUT,
+            follow_redirects=True
+        ) as client:
+            return await asyncio.gather(*[
+                self._fetch_lesson_content_async(client, url, fetches) for url in self.lesson_urls
+            ])
+    
+    def _parse_lesson_html(self, html: str, url: str) -> Optional[str]:
+        """Extract title and text from served lesson HTML (None if it has no usable text)"""
+        if SELECTOLAX_AVAILABLE:
+            title, text_content, is_lesson = self._extract_with_selectolax(html)
+        else:
+            title, text_content, is_lesson = self._extract_with_bs4(html)
+        
+        # Without the lesson body (e.g. a JS app shell) the browser has to render it
+        if not is_lesson or len(text_content) < 50:
+            return None
+        
+        if not title:
+            title = url.split("/")[-1].replace("-", " ").title()
+        
+        logger.info(f"✓ Fetched content from: {title} ({len(text_content)} chars)")
+        return f"\n{'='*80}\n{title}\n{'='*80}\n\n{text_content}\n\n"
+    
+    def _extract_with_selectolax(self, html: str) -> Tuple[str, str, bool]:
+        """Return (title, text, is_lesson) parsed with selectolax's C parser"""
+        from selectolax.parser import HTMLParser
+        tree = HTMLParser(html)
+        tree.strip_tags(['script', 'style', 'noscript'])
+        
+        # Same container preference as the rendered path
+        content = None
+        for selector in _CONTENT_SELECTORS:
+            content = tree.css_first(selector)
+            if content:
+                break
+        
+        text_content = content.text(separator="\n", strip=True) if content else ""
+        if len(text_content) < 50:
+            paragraphs = (p.text(strip=True) for p in tree.css("p"))
+            text_content = "\n\n".join(t for t in paragraphs if t)
+        
+        heading = tree.css_first("h1")
+        body = tree.css_first(_LESSON_BODY_SELECTOR)
+        is_lesson = heading is not None and body is not None and len(body.text(strip=True)) > 50
+        return (heading.text(strip=True) if heading else ""), text_content, is_lesson
+    
+    def _extract_with_bs4(self, html: str) -> Tuple[str, str, bool]:
+        """Return (title, text, is_lesson) parsed with BeautifulSoup"""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'html.parser')
+        for tag in soup(['script', 'style', 'noscript']):
+            tag.decompose()
+        
+        # Same container preference as the rendered path
+        content = None
+        for selector in _CONTENT_SELECTORS:
+            content = soup.select_one(selector)
+            if content:
+                break
+        
+        text_content = content.get_text("\n", strip=True) if content else ""
+        if len(text_content) < 50:
+            paragraphs = soup.find_all("p")
+            text_content = "\n\n".join(p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True))
+        
+        heading = soup.find("h1")
+        body = soup.select_one(_LESSON_BODY_SELECTOR)
+        is_lesson = heading is not None and body is not None and len(body.get_text(strip=True)) > 50
+        return (heading.get_text(strip=True) if heading else ""), text_content, is_lesson
+    
+    def _render_lesson_content(self, url: str) -> Optional[str]:
+        """Extract text content by rendering the lesson in the browser"""
         try:
             logger.info(f"Loading lesson: {url}")
             self.driver.get(url)
-            time.sleep(3)
-            
-            # Wait for page to load - try multiple selectors
-            content = None
-            content_selectors = [
-                (By.CLASS_NAME, "lesson-content"),
-                (By.CSS_SELECTOR, "[class*='lesson']"),
-                (By.CSS_SELECTOR, "[class*='content']"),
-                (By.CSS_SELECTOR, "article"),
-                (By.CSS_SELECTOR, "main"),
-                (By.TAG_NAME, "body"),
-            ]
-            
-            for by, selector in content_selectors:
-                try:
-                    content = WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((by, selector))
-                    )
-                    logger.debug(f"Found content using: {by}='{selector}'")
-                    break
-                except Exception as e:
-                    logger.debug(f"Selector {by}='{selector}' failed: {e}")
-                    continue
-            
-            if not content:
-                logger.warning(f"Could not find content container, using full page")
-                content = self.driver.find_element(By.TAG_NAME, "body")
-            
-            # Extract title - try multiple methods
-            title = None
-            try:
-                title = self.driver.find_element(By.TAG_NAME, "h1").text
-            except:
-                pass
-            
-            if not title or len(title.strip()) == 0:
-                try:
-                    title = self.driver.find_element(By.CSS_SELECTOR, "[class*='title']").text
-                except:
-                    pass
-            
-            if not title or len(title.strip()) == 0:
-                title = url.split("/")[-1].replace("-", " ").title()
-            
-            # Extract all text content
-            text_content = content.text
-            
-            if not text_content or len(text_content.strip()) < 50:
-                logger.warning(f"Content seems empty, trying alternative extraction")
-                # Try getting all paragraphs
-                paragraphs = self.driver.find_elements(By.TAG_NAME, "p")
-                text_content = "\n\n".join([p.text for p in paragraphs if p.text.strip()])
-            
-            logger.info(f"✓ Extracted content from: {title} ({len(text_content)} chars)")
-            return f"\n{'='*80}\n{title}\n{'='*80}\n\n{text_content}\n\n"
+            self._wait_for_lesson_ready()
+            return self._extract_rendered_content(url)
             
         except Exception as e:
             logger.error(f"✗ Failed to extract content from {url}: {e}")
@@ -800,6 +1052,54 @@ class LessonDownloader:
                 pass
             return None
     
+    def _extract_rendered_content(self, url: str) -> str:
+        """Format the lesson rendered in the current window as a text section"""
+        # Title, body text and the paragraph fallback in one WebDriver round-trip
+        extracted = self.driver.execute_script(_EXTRACT_LESSON_JS, _CONTENT_SELECTORS)
+        title = extracted['title'].strip() or url.split("/")[-1].replace("-", " ").title()
+        text_content = extracted['text']
+        
+        if len(text_content.strip()) < 50:
+            logger.warning(f"Content seems empty, using paragraph text")
+            text_content = extracted['paragraphs']
+        
+        logger.info(f"✓ Extracted content from: {title} ({len(text_content)} chars)")
+        return f"\n{'='*80}\n{title}\n{'='*80}\n\n{text_content}\n\n"
+    
+    def _render_lessons_in_tabs(self, pending: Dict[int, str]) -> Dict[int, str]:
+        """Render lessons in batches of rotating tabs so their page loads overlap"""
+        main_handle = self.driver.current_window_handle
+        tabs = min(Config.MAX_WORKERS, len(pending))
+        handles = []
+        for _ in range(tabs):
+            handles.append(self._open_tab())
+        
+        items = list(pending.items())
+        results: Dict[int, str] = {}
+        try:
+            for start in range(0, len(items), tabs):
+                batch = list(zip(handles, items[start:start + tabs]))
+                
+                # Start every load in the batch before waiting on any of them
+                for handle, (_, url) in batch:
+                    self.driver.switch_to.window(handle)
+                    self.driver.execute_script("window.__navigating = true; window.location.href = arguments[0];", url)
+                
+                for handle, (i, url) in batch:
+                    self.driver.switch_to.window(handle)
+                    try:
+                        self._wait_for_lesson_ready()
+                        results[i] = self._extract_rendered_content(url)
+                    except Exception as e:
+                        logger.error(f"✗ Failed to extract content from {url}: {e}")
+        finally:
+            for handle in handles:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(main_handle)
+        
+        return results
+    
     def download_lesson_as_pdf(self, url: str, lesson_number: int) -> Optional[Path]:
         """Download a single lesson as PDF using optimized Chrome print"""
         try:
@@ -808,55 +1108,76 @@ class LessonDownloader:
             # Navigate to page
             self.driver.get(url)
             
-            # Optimized wait: use explicit wait for content, not fixed sleep
-            try:
-                # Wait for any content container to be present (max 10s)
-                WebDriverWait(self.driver, 10).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
-                )
-                # Small additional wait for dynamic content (reduced from 1.5s to 0.5s)
-                time.sleep(0.5)
-            except:
+            # Wait on the rendered lesson body instead of a fixed sleep
+            title = self._wait_for_lesson_ready()
+            if title is None:
                 logger.warning(f"[{lesson_number}] Timeout waiting for page, continuing anyway")
             
-            # Get lesson title for filename
-            title = None
-            try:
-                title = self.driver.find_element(By.TAG_NAME, "h1").text
-            except:
-                pass
+            return self._save_current_page_as_pdf(lesson_number, title)
             
-            if title:
-                # Sanitize filename
-                filename = f"lesson_{lesson_number:02d}_{title[:50]}.pdf"
-                filename = "".join(c for c in filename if c.isalnum() or c in (' ', '_', '-')).rstrip()
-                filename = filename.replace(" ", "_") + ".pdf"
+        except Exception as e:
+            logger.error(f"✗ [{lesson_number}] Failed: {e}")
+            return None
+    
+    def _download_lesson_in_tab(self, url: str, lesson_number: int) -> Optional[Path]:
+        """Download a lesson in a pooled tab so other tabs keep loading meanwhile"""
+        handle = self._tab_handles.get()
+        try:
+            logger.info(f"[{lesson_number}] Downloading: {url}")
+            
+            # Start navigation without blocking; the marker disappears with the old document
+            with self._driver_lock:
+                self.driver.switch_to.window(handle)
+                self.driver.execute_script("window.__navigating = true; window.location.href = arguments[0];", url)
+            
+            # Poll readiness, releasing the driver between checks for the other tabs
+            ready = None
+            deadline = time.time() + Config.PAGE_LOAD_TIMEOUT
+            while time.time() < deadline:
+                with self._driver_lock:
+                    self.driver.switch_to.window(handle)
+                    ready = self.driver.execute_script(_LESSON_READY_JS)
+                if ready:
+                    break
+                time.sleep(0.2)
+            else:
+                logger.warning(f"[{lesson_number}] Timeout waiting for page, continuing anyway")
+            
+            with self._driver_lock:
+                self.driver.switch_to.window(handle)
+                return self._save_current_page_as_pdf(lesson_number, ready and ready['title'])
+            
+        except Exception as e:
+            logger.error(f"✗ [{lesson_number}] Failed: {e}")
+            return None
+        finally:
+            self._tab_handles.put(handle)
+    
+    def _save_current_page_as_pdf(self, lesson_number: int, title: Optional[str] = None) -> Optional[Path]:
+        """Print the page in the current window to the lesson's PDF file"""
+        try:
+            # The readiness check normally supplies the title; look it up only after a timeout
+            if title is None:
+                title = self.driver.execute_script("return document.querySelector('h1')?.innerText || ''")
+            
+            safe_title = _sanitize(title) if title else ""
+            if safe_title:
+                filename = f"lesson_{lesson_number:02d}_{safe_title}.pdf"
             else:
                 filename = f"lesson_{lesson_number:02d}.pdf"
             
             filepath = Config.PDF_DIR / filename
             
-            # Optimized PDF settings for faster generation and better quality
-            print_options = {
-                'paperWidth': 8.5,  # Letter width in inches
-                'paperHeight': 11,  # Letter height in inches
-                'printBackground': True,  # Include backgrounds and colors
-                'marginTop': 0.4,
-                'marginBottom': 0.4,
-                'marginLeft': 0.4,
-                'marginRight': 0.4,
-                'scale': 0.95,  # Slightly smaller to fit more content
-                'preferCSSPageSize': False,
-                'displayHeaderFooter': False,  # Faster without headers/footers
-            }
-            
-            # Generate PDF using Chrome DevTools Protocol
-            result = self.driver.execute_cdp_cmd('Page.printToPDF', print_options)
-            
-            # Decode and save
-            import base64
-            with open(filepath, 'wb') as f:
-                f.write(base64.b64decode(result['data']))
+            # Generate PDF using Chrome DevTools Protocol, streamed back in chunks
+            result = self.driver.execute_cdp_cmd('Page.printToPDF', _PRINT_OPTIONS)
+            
+            if 'stream' in result:
+                self._read_pdf_stream(result['stream'], filepath)
+            # Older Chrome ignores transferMode; decode and save off the driver thread instead
+            elif self._io_executor:
+                self._pending_writes[filepath] = self._io_executor.submit(_write_pdf, result['data'], filepath)
+            else:
+                _write_pdf(result['data'], filepath)
             
             logger.info(f"✓ [{lesson_number}] Saved: {filename}")
             return filepath
@@ -865,39 +1186,72 @@ class LessonDownloader:
             logger.error(f"✗ [{lesson_number}] Failed: {e}")
             return None
     
+    def _new_text_output(self) -> Path:
+        """Create the course text file with its header and return its path"""
+        output_file = Config.OUTPUT_DIR / f"course_content_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(f"COURSE CONTENT\n")
+            f.write(f"Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"{'='*80}\n\n")
+        return output_file
+    
+    def _read_pdf_stream(self, handle: str, filepath: Path):
+        """Copy a CDP IO stream to disk one chunk at a time"""
+        try:
+            with open(filepath, 'wb') as f:
+                while True:
+                    chunk = self.driver.execute_cdp_cmd('IO.read', {'handle': handle, 'size': Config.PDF_STREAM_CHUNK})
+                    data = chunk['data']
+                    f.write(base64.b64decode(data) if chunk.get('base64Encoded') else data.encode('utf-8'))
+                    if chunk.get('eof'):
+                        break
+        finally:
+            self.driver.execute_cdp_cmd('IO.close', {'handle': handle})
+    
     def download_all_lessons_text_parallel(self) -> Optional[Path]:
-        """Download all lessons using single browser with coordinated parallel extraction"""
+        """Download all lessons concurrently over the pooled HTTP session"""
         logger.info("=" * 60)
-        logger.info(f"Starting Fast Sequential Download (single browser)")
+        logger.info(f"Starting Parallel Text Download ({Config.MAX_WORKERS} workers)")
         logger.info("=" * 60)
-        logger.info("💡 Using same browser, navigating quickly between lessons")
         
         # Get lesson URLs
         if not self.lesson_urls:
             logger.error("No lesson URLs available. Call extract_lesson_urls_from_course() first.")
             return None
         
-        all_content = []
-        all_content.append(f"COURSE CONTENT\n")
-        all_content.append(f"Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        all_content.append(f"{'='*80}\n\n")
-        
-        # Download lessons sequentially (but faster with reduced delays)
-        for i, url in enumerate(self.lesson_urls, 1):
-            content = self.extract_lesson_content(url)
-            if content:
-                all_content.append(content)
-            
-            # Shorter delay since we're using same authenticated browser
-            time.sleep(0.1)  # Reduced from 0.3s
-            
-            if i % 5 == 0 or i == len(self.lesson_urls):
-                logger.info(f"Progress: {i}/{len(self.lesson_urls)} lessons downloaded")
-        
-        # Save to file
-        output_file = Config.OUTPUT_DIR / f"course_content_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.writelines(all_content)
+        total = len(self.lesson_urls)
+        output_file = self._new_text_output()
+        if HTTPX_AVAILABLE and _ADAPTER is not None:
+            # All fetches overlap on one event loop; the browser only handles leftovers
+            contents = asyncio.run(self._fetch_all_lessons_async())
+            results: Dict[int, str] = {}
+            pending: Dict[int, str] = {}
+            for i, (url, content) in enumerate(zip(self.lesson_urls, contents), 1):
+                if content:
+                    results[i] = content
+                else:
+                    logger.debug(f"HTTP fetch gave no usable content, rendering in browser: {url}")
+                    pending[i] = url
+            if pending:
+                results.update(self._render_lessons_in_tabs(pending))
+            logger.info(f"Progress: {total}/{total} lessons downloaded")
+            
+            # Keep course order regardless of completion order
+            with open(output_file, 'a', encoding='utf-8') as f:
+                for i in sorted(results):
+                    f.write(results[i])
+        else:
+            # Each worker thread gets its own session sharing one bounded connection pool;
+            # map() yields in course order, so each lesson is written as soon as its turn comes
+            with ThreadPoolExecutor(max_workers=Config.MAX_WORKERS) as executor, \
+                    open(output_file, 'a', encoding='utf-8') as f:
+                for i, content in enumerate(executor.map(self.extract_lesson_content, self.lesson_urls), 1):
+                    if content:
+                        f.write(content)
+                    
+                    if i % 5 == 0 or i == total:
+                        f.flush()
+                        logger.info(f"Progress: {i}/{total} lessons downloaded")
         
         logger.info(f"✓ Course content saved to: {output_file}")
         return output_file
@@ -913,24 +1267,17 @@ class LessonDownloader:
             logger.error("No lesson URLs available. Call extract_lesson_urls_from_course() first.")
             return None
         
-        all_content = []
-        all_content.append(f"COURSE CONTENT\n")
-        all_content.append(f"Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        all_content.append(f"{'='*80}\n\n")
-        
-        for i, url in enumerate(self.lesson_urls, 1):
-            content = self.extract_lesson_content(url)
-            if content:
-                all_content.append(content)
-            time.sleep(0.1)  # Reduced delay
-            
-            if i % 5 == 0 or i == len(self.lesson_urls):
-                logger.info(f"Progress: {i}/{len(self.lesson_urls)} lessons downloaded")
-        
-        # Save to file
-        output_file = Config.OUTPUT_DIR / f"course_content_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.writelines(all_content)
+        # Each lesson is written as soon as it is extracted
+        output_file = self._new_text_output()
+        with open(output_file, 'a', encoding='utf-8') as f:
+            for i, url in enumerate(self.lesson_urls, 1):
+                content = self.extract_lesson_content(url)
+                if content:
+                    f.write(content)
+                
+                if i % 5 == 0 or i == len(self.lesson_urls):
+                    f.flush()
+                    logger.info(f"Progress: {i}/{len(self.lesson_urls)} lessons downloaded")
         
         logger.info(f"✓ Course content saved to: {output_file}")
         return output_file
@@ -951,40 +1298,143 @@ class LessonDownloader:
         
         logger.info(f"Downloading {total} lessons...")
         
-        for i, url in enumerate(self.lesson_urls, 1):
-            pdf_path = self.download_lesson_as_pdf(url, i)
-            if pdf_path:
-                pdf_files.append(pdf_path)
-            
-            # Minimal delay - no need to wait, browser handles rate limiting
-            # Only add tiny delay to avoid overwhelming the server
-            if i < total:  # Don't wait after last lesson
-                time.sleep(0.1)  # Reduced from 0.3s to 0.1s
-            
-            # Progress indicator
-            if i % 5 == 0 or i == total:
-                logger.info(f"Progress: {i}/{total} lessons ({(i/total)*100:.1f}%)")
+        # PDFs need images and fonts, so lift the text-mode asset blocking
+        self._set_assets_blocked(False)
+        self._io_executor = ThreadPoolExecutor(max_workers=2)
+        try:
+            if Config.USE_PROCESSES and Config.MAX_WORKERS > 1:
+                pdf_files = self.download_all_lessons_pdf_parallel()
+            elif Config.MAX_WORKERS > 1:
+                pdf_files = self._download_lessons_pdf_tabs()
+            else:
+                for i, url in enumerate(self.lesson_urls, 1):
+                    pdf_path = self.download_lesson_as_pdf(url, i)
+                    if pdf_path:
+                        pdf_files.append(pdf_path)
+                    
+                    # Progress indicator
+                    if i % 5 == 0 or i == total:
+                        logger.info(f"Progress: {i}/{total} lessons ({(i/total)*100:.1f}%)")
+        finally:
+            # Let queued PDF writes finish before reporting or merging
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+            self._set_assets_blocked(True)
+        
+        for filepath, future in self._pending_writes.items():
+            if future.exception():
+                logger.error(f"✗ Failed to write {filepath.name}: {future.exception()}")
+                pdf_files.remove(filepath)
+        self._pending_writes.clear()
         
         logger.info(f"✓ Successfully downloaded {len(pdf_files)}/{total} PDFs")
         return pdf_files
     
+    def _download_lessons_pdf_tabs(self) -> List[Path]:
+        """Render lessons across MAX_WORKERS tabs of the same browser session"""
+        main_handle = self.driver.current_window_handle
+        
+        # Pre-open one tab per worker, but never more tabs than lessons
+        total = len(self.lesson_urls)
+        tabs = min(Config.MAX_WORKERS, total)
+        for _ in range(tabs):
+            self._tab_handles.put(self._open_tab())
+        
+        results: Dict[int, Path] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=tabs) as executor:
+                futures = {
+                    executor.submit(self._download_lesson_in_tab, url, i): i
+                    for i, url in enumerate(self.lesson_urls, 1)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    pdf_path = future.result()
+                    if pdf_path:
+                        results[futures[future]] = pdf_path
+                    
+                    if done % 5 == 0 or done == total:
+                        logger.info(f"Progress: {done}/{total} lessons ({(done/total)*100:.1f}%)")
+        finally:
+            # Close the worker tabs and return to the original window
+            while not self._tab_handles.empty():
+                self.driver.switch_to.window(self._tab_handles.get())
+                self.driver.close()
+            self.driver.switch_to.window(main_handle)
+        
+        return [results[i] for i in sorted(results)]
+    
+    def download_all_lessons_pdf_parallel(self, workers: Optional[int] = None) -> List[Path]:
+        """Shard lessons across independent Chrome processes, one browser each"""
+        workers = min(workers or Config.MAX_WORKERS, len(self.lesson_urls))
+        
+        # Cookies are serialized once here and replayed into every worker browser
+        auth_cookies = self.driver.get_cookies()
+        size = -(-len(self.lesson_urls) // workers)
+        jobs = [
+            (auth_cookies, self.lesson_urls[start:start + size], start + 1, Config.HEADLESS)
+            for start in range(0, len(self.lesson_urls), size)
+        ]
+        
+        logger.info(f"Rendering PDFs in {len(jobs)} Chrome processes")
+        with multiprocessing.get_context("spawn").Pool(len(jobs)) as pool:
+            chunks = pool.starmap(_worker_download_chunk, jobs)
+        
+        results = [item for chunk in chunks for item in chunk]
+        return [path for _, path in sorted(results)]
+    
+    @staticmethod
+    def _merge_batch(pdf_files: List[Path], output_file: Path):
+        """Merge PDFs in memory with pypdf, keeping one copy of shared resources"""
+        from pypdf import PdfWriter
+        
+        # Pages are appended into one writer and serialized once at the end
+        writer = PdfWriter()
+        for pdf_file in pdf_files:
+            writer.append(str(pdf_file))
+        
+        # Every lesson embeds the same fonts and logos; keep one copy of each
+        writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+        
+        with open(output_file, 'wb') as f:
+            writer.write(f)
+        writer.close()
+    
+    @staticmethod
+    def _concat_pdfs(pdf_files: List[Path], output_file: Path):
+        """Concatenate PDFs with qpdf, which reads source objects lazily while saving"""
+        import pikepdf
+        
+        with pikepdf.Pdf.new() as merged, ExitStack() as stack:
+            for pdf_file in pdf_files:
+                merged.pages.extend(stack.enter_context(pikepdf.open(pdf_file)).pages)
+            merged.save(output_file, compress_streams=True,
+                        object_stream_mode=pikepdf.ObjectStreamMode.generate)
+    
     def merge_pdfs(self, pdf_files: List[Path]) -> Optional[Path]:
-        """Merge all PDFs into a single file"""
+        """Merge all PDFs into a single file (pdf_files must already be in lesson order)"""
         if not pdf_files:
             logger.warning("No PDFs to merge")
             return None
         
         try:
             logger.info(f"Merging {len(pdf_files)} PDFs...")
-            
-            merger = PdfMerger()
-            
-            for pdf_file in sorted(pdf_files):
-                merger.append(str(pdf_file))
-            
             output_file = Config.OUTPUT_DIR / f"course_complete_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            merger.write(str(output_file))
-            merger.close()
+            batch = Config.MERGE_BATCH_SIZE
+            
+            if not PIKEPDF_AVAILABLE or len(pdf_files) <= batch:
+                self._merge_batch(pdf_files, output_file)
+            else:
+                # pypdf keeps every appended page in memory, so merge bounded batches to
+                # temp files and let qpdf stream those into the final PDF. pypdf is pure
+                # Python, so the batches run in parallel processes rather than threads.
+                with tempfile.TemporaryDirectory(dir=Config.OUTPUT_DIR) as tmp:
+                    jobs = [
+                        (pdf_files[start:start + batch], Path(tmp) / f"part_{n:04d}.pdf")
+                        for n, start in enumerate(range(0, len(pdf_files), batch))
+                    ]
+                    with multiprocessing.get_context("spawn").Pool(min(Config.MAX_WORKERS, len(jobs))) as pool:
+                        pool.starmap(self._merge_batch, jobs)
+                    self._concat_pdfs([part for _, part in jobs], output_file)
             
             logger.info(f"✓ Merged PDF saved to: {output_file}")
             return output_file
@@ -993,6 +1443,31 @@ class LessonDownloader:
             logger.error(f"✗ Failed to merge PDFs: {e}")
             return None
 
+def _worker_download_chunk(auth_cookies: List[Dict], chunk: List[str], start_idx: int,
+                           headless: bool = True) -> List[tuple]:
+    """Process-pool entry point: render one contiguous chunk of lessons to PDF"""
+    # Spawned workers re-import this module, so CLI overrides must be reapplied
+    Config.HEADLESS = headless
+    driver = ChromeDriverSetup.get_driver(persist_profile=False)
+    try:
+        driver.get(Config.BASE_URL)
+        for cookie in auth_cookies:
+            cookie.pop('sameSite', None)
+            driver.add_cookie(cookie)
+        
+        downloader = LessonDownloader(driver)
+        downloader._set_assets_blocked(False)
+        
+        results = []
+        for i, url in enumerate(chunk, start_idx):
+            pdf_path = downloader.download_lesson_as_pdf(url, i)
+            if pdf_path:
+                results.append((i, pdf_path))
+        logger.info(f"✓ Worker finished lessons {start_idx}-{start_idx + len(chunk) - 1}")
+        return results
+    finally:
+        driver.quit()
+
 # ==================== Main Application ====================
 
 class EducativeCourseDownloader:
@@ -1009,7 +1484,7 @@ class EducativeCourseDownloader:
         self.downloader = None
         self.course_url = course_url
     
-    def setup(self):
+    def setup(self, download_format: str = "text"):
         """Initialize components"""
         logger.info("=" * 60)
         logger.info("Educative Course Downloader")
@@ -1021,7 +1496,7 @@ class EducativeCourseDownloader:
         Config.setup()
         
         # Setup Chrome driver
-        self.driver = ChromeDriverSetup.get_driver()
+        self.driver = ChromeDriverSetup.get_driver(text_only=(download_format == "text"))
         
         # Setup handlers
         self.auth_handler = AuthenticationHandler(self.driver)
@@ -1036,13 +1511,27 @@ class EducativeCourseDownloader:
     def run(self, download_format: str = "text", use_google_login: bool = True, manual_login: bool = False, parallel: bool = True):
         """Main execution flow"""
         try:
-            self.setup()
+            self.setup(download_format)
+            
+            # Headless only works with a saved session: OTP entry and manual login both
+            # happen in the browser window, so reopen it visibly when a login is needed
+            checked_saved = Config.HEADLESS and not os.getenv("CI")
+            restored = checked_saved and self.auth_handler.restore_session()
+            if checked_saved and not restored:
+                logger.info("No valid saved session - reopening the browser visibly to log in")
+                self.cleanup()
+                Config.HEADLESS = False
+                self.setup(download_format)
             
             # Authenticate
-            if not self.auth_handler.authenticate(use_google=use_google_login, manual=manual_login):
+            if not restored and not self.auth_handler.authenticate(
+                    use_google=use_google_login, manual=manual_login, try_saved=not checked_saved):
                 logger.error("Authentication failed. Exiting.")
                 return False
             
+            # Lesson pages are fetched over HTTP; the browser is kept for JS-rendered steps
+            build_http_session(self.driver)
+            
             # Extract lesson URLs from course page
             if self.course_url:
                 logger.info("Extracting lesson URLs from course page...")
@@ -1125,13 +1614,28 @@ def main():
     parser.add_argument(
         '--headless',
         action='store_true',
-        help='Run browser in headless mode'
+        help='Run browser in headless mode (default)'
+    )
+    parser.add_argument(
+        '--headed',
+        action='store_true',
+        help='Show the browser window (needed to enter an OTP)'
     )
     parser.add_argument(
         '--no-parallel',
         action='store_true',
         help='Disable parallel downloads (use sequential)'
     )
+    parser.add_argument(
+        '--debug',
+        action='store_true',
+        help='Save diagnostic screenshots even when steps succeed'
+    )
+    parser.add_argument(
+        '--processes',
+        action='store_true',
+        help='Render PDFs in separate Chrome processes instead of browser tabs'
+    )
     parser.add_argument(
         '--workers',
         type=int,
@@ -1148,11 +1652,17 @@ def main():
         Config.PASSWORD = args.password
     if args.headless:
         Config.HEADLESS = True
+    if args.headed:
+        Config.HEADLESS = False
     if args.workers:
         Config.MAX_WORKERS = args.workers
+    if args.debug:
+        Config.DEBUG_SCREENSHOTS = True
+    if args.processes:
+        Config.USE_PROCESSES = True
     
     # Manual mode cannot be headless
-    if args.manual and args.headless:
+    if args.manual and Config.HEADLESS:
         logger.warning("Manual mode requires visible browser, disabling headless")
         Config.HEADLESS = False
     
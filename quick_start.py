@@ -4,21 +4,26 @@ Educative Course Downloader with Complete Content Capture
 Uses multiple methods to ensure NO content is lost:
 1. Full-page screenshots (most reliable)
 2. Playwright PDF with enhanced loading
-3. img2pdf for screenshot conversion
+3. Screenshot JPEGs wrapped into PDF pages verbatim
 """
 
 import asyncio
 import os
 import re
 import json
-import img2pdf
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from importlib.util import find_spec
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 from dotenv import load_dotenv
-from playwright.async_api import async_playwright, Page, Browser
-from PyPDF2 import PdfMerger
-from PIL import Image
+from playwright.async_api import async_playwright, Playwright, Page, Browser, BrowserContext
+import pikepdf
+
+# Optional: uvloop (libuv) event loop, cheaper per CDP message than the default selector loop
+UVLOOP_AVAILABLE = find_spec("uvloop") is not None
 
 # Configuration
 load_dotenv()
@@ -27,10 +32,46 @@ class Config:
     EMAIL = os.getenv('EDUCATIVE_EMAIL', '')
     PASSWORD = os.getenv('EDUCATIVE_PASSWORD', '')
     OUTPUT_DIR = Path('output')
-    COOKIES_FILE = OUTPUT_DIR / 'cookies.json'
-    MAX_WORKERS = 10  # Parallel downloads
+    STATE_FILE = OUTPUT_DIR / 'state.json'  # Saved login (cookies + localStorage), restored at context creation
+    MAX_WORKERS = 15  # Parallel downloads (backs off automatically on rate limiting)
+    LONGEST_FIRST = False  # Schedule the heaviest lessons first (one HEAD request per lesson up front)
+    PAGES_PER_CONTEXT = 5  # Workers sharing one isolated context when PROFILE_DIR is None
+    PROFILE_DIR = OUTPUT_DIR / '.playwright_profile'  # Shared on-disk download profile; None = isolated contexts
+    RATE_LIMIT_RECOVERY = 10  # Successful lessons before a throttled run gets one worker slot back
+    RATE_LIMIT_BACKOFF = 10  # Seconds per attempt to wait after a 429 without Retry-After
     MAX_RETRIES = 5  # Retry attempts for failed downloads
+    MIN_PDF_BYTES = 10_000  # Existing lesson PDFs smaller than this are downloaded again
     SCREENSHOT_METHOD = True  # Use screenshots for guaranteed content capture
+    JPEG_QUALITY = 78  # Screenshot quality (JPEG is embedded into the PDF unchanged)
+    VIEWPORT = {'width': 1440, 'height': 900}  # Download contexts
+    DEVICE_SCALE_FACTOR = 1.25  # Screenshot pixels per CSS pixel; sharper text than 1.0, far smaller than 2x
+    TILE_HEIGHT = None  # Pixels per screenshot tile / PDF page; None = one viewport height
+    TILE_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None  # tmpfs for tiles; None keeps them in memory
+    LOGIN_TIMEOUT = 120  # Seconds allowed for manual login
+    LESSON_LINK_SELECTOR = 'a.Lesson_lesson__uSC7b'  # TOC links on the course page (DOM fallback)
+    COURSE_API_URL = 'https://www.educative.io/api/v1/collection/{slug}'  # Course TOC JSON; DOM scrape is the fallback
+    NAV_TIMEOUT = 45000  # ms, context default for goto / load-state waits
+    ACTION_TIMEOUT = 30000  # ms, context default for selectors, screenshots and other actions
+    HEADLESS = os.getenv('EDUCATIVE_HEADLESS', 'true').lower() != 'false'
+    BROWSER_ARGS = [
+        '--disable-blink-features=AutomationControlled',
+        '--disable-dev-shm-usage',
+        '--disable-gpu',
+        '--no-sandbox',
+        '--disable-extensions',
+        '--disable-background-networking',
+        '--disable-features=Translate,TranslateUI,BackForwardCache',
+        # Many tabs render at once and are never focused; keep them all at full speed
+        '--disable-background-timer-throttling',
+        '--disable-backgrounding-occluded-windows',
+        '--disable-renderer-backgrounding',
+        '--js-flags=--max-old-space-size=512',  # Lesson pages are short-lived
+    ]
+    # URL patterns blocked per page over CDP (request routing would switch off the HTTP cache)
+    BLOCKED_URLS = ['*google-analytics*', '*googletagmanager*', '*doubleclick*', '*segment.io*', '*amplitude*',
+                    '*intercom*', '*hotjar*', '*fullstory*', '*sentry*',
+                    '*.mp4', '*.webm', '*.mp3', '*.m3u8', '*.webmanifest']
+    BLOCKED_FONT_URLS = ['*.woff', '*.woff2', '*.ttf', '*.otf']  # Not needed by page.pdf(); screenshots keep them
 
 # Course URLs - CHANGE THIS
 COURSE_URLS = [
@@ -47,6 +88,226 @@ COURSE_URLS = [
 
 ]
 
+# Filename sanitizing: drop unsafe characters, then collapse dash/whitespace runs
+_SANI_BAD = re.compile(r'[^\w\s-]')
+_SANI_WS = re.compile(r'[-\s]+')
+_COURSE_SLUG = re.compile(r'/courses/([^/]+)')  # Course name from a course URL
+
+
+_JPEG_COLORSPACES = {1: 'DeviceGray', 3: 'DeviceRGB', 4: 'DeviceCMYK'}
+
+
+def _jpeg_info(data: bytes) -> Tuple[int, int, str]:
+    """Width, height and PDF colour space read from a JPEG's SOF marker"""
+    i = 2  # Skip SOI
+    while i + 9 < len(data):
+        marker = data[i + 1]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[i + 5:i + 7], 'big')
+            width = int.from_bytes(data[i + 7:i + 9], 'big')
+            return width, height, _JPEG_COLORSPACES[data[i + 9]]
+        i += 2 + int.from_bytes(data[i + 2:i + 4], 'big')
+    raise ValueError("JPEG has no SOF marker")
+
+
+# Resolves once no DOM mutation has happened for `idle` ms (or after `max` ms); evaluated on its own
+# with {idle, max}, or spliced into other page scripts
+_SETTLE_JS = """
+    ({idle, max}) => new Promise(resolve => {
+        let timer;
+        const observer = new MutationObserver(() => {
+            clearTimeout(timer);
+            timer = setTimeout(done, idle);
+        });
+        const cap = setTimeout(done, max);
+        function done() {
+            observer.disconnect();
+            clearTimeout(timer);
+            clearTimeout(cap);
+            resolve();
+        }
+        observer.observe(document.body, {childList: true, subtree: true, attributes: true});
+        timer = setTimeout(done, idle);
+    })
+"""
+
+# Returns false when the page has no lazy media; otherwise switches it to eager loading, walks the
+# page once (a frame per viewport step) for IntersectionObserver widgets and waits for the DOM to settle
+_EAGER_LOAD_JS = """
+    async () => {
+        const lazy = document.querySelectorAll('img[loading="lazy"], iframe[loading="lazy"], [data-src], [data-lazy]');
+        if (!lazy.length) {
+            return false;
+        }
+        lazy.forEach(el => {
+            if (el.loading === 'lazy') el.loading = 'eager';
+            if (el.dataset.src && el.getAttribute('src') !== el.dataset.src) el.src = el.dataset.src;
+        });
+        
+        const settle = """ + _SETTLE_JS.strip() + """;
+        
+        const frame = () => new Promise(r => requestAnimationFrame(r));
+        for (let y = 0; y < document.body.scrollHeight; y += window.innerHeight) {
+            window.scrollTo(0, y);
+            await frame();
+        }
+        window.scrollTo(0, 0);
+        await settle({idle: 300, max: 2000});
+        return true;
+    }
+"""
+
+
+# True once every image has loaded or failed; pixel-sized trackers (<= 8px boxes) are not waited on
+_IMAGES_READY_JS = """
+    () => Array.from(document.images).every(img =>
+        img.complete || (img.width > 0 && img.width <= 8 && img.height <= 8))
+"""
+
+# Clicks the minimap toggle if there is one (waiting two frames for the repaint), then returns
+# [hidden, document height] so the capture needs no second round-trip
+_HIDE_MINIMAP_JS = """
+    async () => {
+        const selectors = [
+            '[aria-label*="minimap" i]',
+            '[title*="minimap" i]',
+            'button[class*="minimap" i]',
+            '.minimap-toggle',
+            '[data-testid*="minimap" i]'
+        ];
+        const btn = selectors.map(s => document.querySelector(s)).find(Boolean);
+        let hidden = false;
+        if (btn) {
+            try {
+                btn.click();
+                await new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)));
+                hidden = true;
+            } catch (e) {}  // Minimap already hidden or not clickable
+        }
+        return [hidden, document.documentElement.scrollHeight];
+    }
+"""
+
+
+class _JpegPdfWriter:
+    """Streams JPEG pages into a PDF file, embedding each JPEG verbatim (DCTDecode).
+    Page objects are written as pages arrive; the catalog and page tree are written on close."""
+    
+    def __init__(self, pdf_path: Path):
+        self.f = open(pdf_path, 'wb')
+        self.f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self.offsets: Dict[int, int] = {}
+        self.pages: List[int] = []
+        self.next_obj = 3  # 1 = catalog, 2 = page tree
+        self.size = 0
+    
+    def __enter__(self) -> '_JpegPdfWriter':
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def _obj(self, num: int, body: str, stream: Optional[bytes] = None) -> None:
+        self.offsets[num] = self.f.tell()
+        self.f.write(f"{num} 0 obj\n{body}".encode())
+        if stream is not None:
+            self.f.write(b"\nstream\n" + stream + b"\nendstream")
+        self.f.write(b"\nendobj\n")
+    
+    def add_page(self, tile: Union[Path, bytes]) -> None:
+        """Append one JPEG (file or bytes) as a page sized to the image"""
+        data = tile if isinstance(tile, bytes) else tile.read_bytes()  # One file-backed tile resident at a time
+        width, height, colorspace = _jpeg_info(data)
+        # 96 dpi CSS pixels -> 72 dpi points, so the page size ignores the capture scale
+        w, h = (width * 0.75 / Config.DEVICE_SCALE_FACTOR, height * 0.75 / Config.DEVICE_SCALE_FACTOR)
+        page, contents, image = self.next_obj, self.next_obj + 1, self.next_obj + 2
+        self.next_obj += 3
+        self._obj(page, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {w:g} {h:g}] "
+                        f"/Resources << /XObject << /Im0 {image} 0 R >> >> /Contents {contents} 0 R >>")
+        content = f"q {w:g} 0 0 {h:g} 0 0 cm /Im0 Do Q".encode()
+        self._obj(contents, f"<< /Length {len(content)} >>", content)
+        self._obj(image, f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                         f"/ColorSpace /{colorspace} /BitsPerComponent 8 /Filter /DCTDecode /Length {len(data)} >>", data)
+        self.pages.append(page)
+    
+    def close(self) -> int:
+        """Write the page tree, catalog and xref table; returns the PDF size in bytes"""
+        if self.f.closed:
+            return self.size
+        kids = " ".join(f"{page} 0 R" for page in self.pages)
+        self._obj(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>")
+        self._obj(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        xref = self.f.tell()
+        self.f.write(f"xref\n0 {self.next_obj}\n0000000000 65535 f \n".encode())
+        self.f.write("".join(f"{self.offsets[num]:010d} 00000 n \n" for num in range(1, self.next_obj)).encode())
+        self.f.write(f"trailer\n<< /Size {self.next_obj} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+        self.size = self.f.tell()
+        self.f.close()
+        return self.size
+
+
+def _write_tiles_pdf(tiles: List[Union[Path, bytes]], pdf_path: Path) -> int:
+    """Write JPEG tiles as a PDF, one page each; returns the PDF size in bytes"""
+    with _JpegPdfWriter(pdf_path) as writer:
+        for tile in tiles:
+            writer.add_page(tile)
+    return writer.size
+
+
+def _pdf_jpegs(pdf_path: Path):
+    """Yield the JPEG of each page of a PDF written by _JpegPdfWriter, one page at a time"""
+    with pikepdf.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            yield page.Resources.XObject.Im0.read_raw_bytes()
+
+
+class RateLimited(RuntimeError):
+    """HTTP 429 on a lesson; carries the server's Retry-After in seconds, if any"""
+    
+    def __init__(self, retry_after: Optional[int]):
+        super().__init__("HTTP 429 (rate limited)")
+        self.retry_after = retry_after
+
+
+class Admission:
+    """Concurrency limit that shrinks on rate limiting and grows back after a run of successes"""
+    
+    def __init__(self, limit: int):
+        self.max_limit = self.limit = limit
+        self.active = 0
+        self.streak = 0
+        self.cv = asyncio.Condition()
+    
+    async def __aenter__(self):
+        async with self.cv:
+            await self.cv.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+    
+    async def __aexit__(self, *exc):
+        async with self.cv:
+            self.active -= 1
+            self.cv.notify()
+    
+    def throttled(self) -> None:
+        """Drop one slot (never below one); lessons already in flight finish normally"""
+        self.streak = 0
+        if self.limit > 1:
+            self.limit -= 1
+            print(f"🐢 Rate limited - concurrency lowered to {self.limit}")
+    
+    def failed(self) -> None:
+        """A failed attempt breaks the run of successes"""
+        self.streak = 0
+    
+    async def succeeded(self) -> None:
+        """Count a success and reopen a slot after RATE_LIMIT_RECOVERY in a row"""
+        self.streak += 1
+        if self.limit < self.max_limit and self.streak >= Config.RATE_LIMIT_RECOVERY:
+            self.streak = 0
+            async with self.cv:
+                self.limit += 1
+                self.cv.notify_all()
+
 
 class CourseDownloader:
     """Downloads Educative courses with complete content capture"""
@@ -56,61 +317,85 @@ class CourseDownloader:
         self.course_name = self._extract_course_name(course_url)
         self.course_dir = Config.OUTPUT_DIR / self.course_name
         self.browser: Optional[Browser] = None
+        self.shared_context: Optional[BrowserContext] = None  # Persistent profile used by all workers
         self.lesson_urls: List[str] = []
-        self.cookies: Optional[List] = None  # Store cookies for reuse
+        self.storage_state: Optional[dict] = None  # In-memory login state, installed by each worker context
+        self.course_writer: Optional[_JpegPdfWriter] = None  # Course PDF, appended to as lessons finish in order
+        self.next_course_lesson = 1  # Next lesson number the course PDF is waiting for
+        self.course_pdf: Optional[Path] = None  # Set once the incrementally written course PDF is complete
+        self.tile_dir: Optional[Path] = None  # tmpfs scratch directory for the tiles, removed after the run
+        self.lesson_map_file = self.course_dir / 'lessons.json'  # URL -> finished lesson PDF, for resuming
+        self.admission: Optional[Admission] = None  # Adaptive cap on lessons in flight
+        # Only the final render step differs between the two methods; pick it once
+        self._render = self._render_screenshot if Config.SCREENSHOT_METHOD else self._render_pdf
+        self.blocked_urls = Config.BLOCKED_URLS + ([] if Config.SCREENSHOT_METHOD else Config.BLOCKED_FONT_URLS)
         
     def _extract_course_name(self, url: str) -> str:
         """Extract course name from URL"""
-        match = re.search(r'/courses/([^/]+)', url)
+        match = _COURSE_SLUG.search(url)
         return match.group(1) if match else 'course'
     
     def _sanitize_filename(self, name: str) -> str:
         """Create safe filename"""
-        name = re.sub(r'[^\w\s-]', '', name)
-        name = re.sub(r'[-\s]+', '_', name)
-        return name[:80]
+        return _SANI_WS.sub('_', _SANI_BAD.sub('', name))[:80]
+    
+    @staticmethod
+    def _save_json(path: Path, data) -> None:
+        """Write compact JSON atomically (tmp file + rename), skipping the write when unchanged"""
+        payload = json.dumps(data, separators=(',', ':'))
+        try:
+            if path.read_text() == payload:
+                return
+        except OSError:
+            pass
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        tmp.write_text(payload)
+        os.replace(tmp, path)
+    
+    @staticmethod
+    def _load_saved_state() -> Optional[dict]:
+        """Playwright storage_state from the last run, or None if missing or unreadable"""
+        try:
+            return json.loads(Config.STATE_FILE.read_text())
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _apply_timeouts(context: BrowserContext) -> None:
+        """Set navigation/action timeouts once per context instead of per call"""
+        context.set_default_navigation_timeout(Config.NAV_TIMEOUT)
+        context.set_default_timeout(Config.ACTION_TIMEOUT)
+    
+    async def _session_is_valid(self, page: Page) -> bool:
+        """Check the saved session that was installed when the page's context was created"""
+        print("Found saved session, attempting auto-login...")
+        try:
+            await page.goto(self.course_url, wait_until='domcontentloaded')
+            
+            # Check if authentication was successful; an expired session is cleared by the
+            # response's Set-Cookie, which has been applied by the time the DOM is ready
+            if await page.evaluate("() => document.cookie.includes('logged_in')"):
+                print("✓ Using saved session")
+                return True
+            print("⚠️ Saved session is invalid or expired")
+        except Exception as e:
+            print(f"⚠️ Error checking saved session: {e}")
+        return False
     
     async def authenticate(self, page: Page) -> bool:
-        """Authenticate with saved cookies or manual login"""
+        """Authenticate with manual login"""
         try:
             print("🔐 Authenticating...")
             
-            # Try saved cookies - load BEFORE navigation
-            if Config.COOKIES_FILE.exists():
-                print("Found saved cookies, attempting auto-login...")
-                try:
-                    with open(Config.COOKIES_FILE, 'r') as f:
-                        cookies = json.load(f)
-                    
-                    # Load cookies into context FIRST
-                    await page.context.add_cookies(cookies)
-                    
-                    # THEN navigate to course URL
-                    await page.goto(self.course_url, timeout=90000, wait_until='domcontentloaded')
-                    await page.wait_for_timeout(3000)
-                    
-                    # Check if authentication was successful
-                    if await page.evaluate("() => document.cookie.includes('logged_in')"):
-                        print("✓ Using saved session")
-                        self.cookies = cookies  # Store for parallel downloads
-                        return True
-                    else:
-                        print("⚠️ Saved cookies are invalid or expired")
-                except Exception as e:
-                    print(f"⚠️ Error loading cookies: {e}")
-                    print("Proceeding to manual login...")
-            
             # Manual/auto login
             print("Opening login page...")
             try:
-                await page.goto('https://www.educative.io/login', timeout=90000, wait_until='domcontentloaded')
-                print("✓ Page loaded")
-                await page.wait_for_timeout(3000)
+                await page.goto('https://www.educative.io/login', wait_until='domcontentloaded')
                 print("✓ Login page ready")
             except Exception as e:
                 print(f"⚠️ Page load issue: {e}")
                 print("Continuing anyway...")
-                await page.wait_for_timeout(3000)
             
             # Manual login only
             print("\n" + "="*70)
@@ -118,83 +403,140 @@ class CourseDownloader:
             print("   1. Click 'Continue with Email'")
             print("   2. Enter your email and password")  
             print("   3. Complete OTP if required")
-            print("   You have 50 seconds...")
+            print(f"   You have {Config.LOGIN_TIMEOUT} seconds...")
             print("="*70 + "\n")
-            await page.wait_for_timeout(50000)
             
-            # Verify and save
-            print("Verifying login...")
+            # Continue the moment the login cookie appears instead of sleeping a fixed time
             try:
-                await page.goto(self.course_url, timeout=90000, wait_until='domcontentloaded')
-                await page.wait_for_timeout(3000)
+                await page.wait_for_function("() => document.cookie.includes('logged_in')",
+                                             timeout=Config.LOGIN_TIMEOUT * 1000, polling=500)
             except Exception as e:
-                print(f"⚠️ Navigation to course failed: {e}")
+                print(f"⚠️ Login not detected: {e}")
                 return False
             
-            if await page.evaluate("() => document.cookie.includes('logged_in')"):
-                cookies = await page.context.cookies()
-                Config.OUTPUT_DIR.mkdir(exist_ok=True)
-                with open(Config.COOKIES_FILE, 'w') as f:
-                    json.dump(cookies, f)
-                print("✓ Authentication successful")
-                self.cookies = cookies  # Store for parallel downloads
-                return True
-            
-            return False
+            self._save_json(Config.STATE_FILE, await page.context.storage_state())
+            print("✓ Authentication successful")
+            return True
         except Exception as e:
             print(f"❌ Auth failed: {e}")
             return False
     
+    async def _lesson_urls_from_api(self, page: Page) -> List[str]:
+        """Lesson URLs from the course JSON the site itself loads; empty if the endpoint or schema differs"""
+        try:
+            response = await page.context.request.get(Config.COURSE_API_URL.format(slug=self.course_name))
+            if not response.ok:
+                return []
+            data = await response.json()
+        except Exception:
+            return []
+        
+        # Only the table of contents is walked: the rest of the payload (related courses,
+        # authors, ...) can hold "pages" lists too
+        try:
+            toc = data['instance']['details']['toc']
+        except (KeyError, TypeError):
+            return []
+        
+        # Collect the slug of every entry in any "pages" list, wherever the TOC nests it
+        slugs = []
+        stack = [toc]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                pages = node.get('pages')
+                if isinstance(pages, list):
+                    slugs.extend(p['slug'] for p in pages if isinstance(p, dict) and isinstance(p.get('slug'), str))
+                stack.extend(reversed(list(node.values())))
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
+        
+        links = [f"https://www.educative.io/courses/{self.course_name}/{slug}" for slug in dict.fromkeys(slugs)]
+        
+        # The endpoint is undocumented, so its list is only used once the course page's own
+        # TOC agrees with it; an unrendered TOC counts as unverified and the DOM scrape runs
+        if not links:
+            return []
+        try:
+            if page.url.rstrip('/') != self.course_url.rstrip('/'):
+                await page.goto(self.course_url, wait_until='domcontentloaded')
+            await page.wait_for_selector(Config.LESSON_LINK_SELECTOR, timeout=10000)
+            shown = await page.eval_on_selector_all(Config.LESSON_LINK_SELECTOR, 'els => els.map(e => e.href)')
+        except Exception:
+            shown = []
+        known = set(links)
+        if not shown or any(href.split('?')[0].split('#')[0].rstrip('/') not in known for href in shown):
+            print("   ⚠️  Couldn't verify the course API lesson list against the course page, scraping instead")
+            return []
+        return links
+    
+    async def _lesson_urls_from_dom(self, page: Page) -> List[str]:
+        """Lesson URLs scraped from the rendered course page"""
+        # A saved-session login already left the page on the course; don't load it twice
+        if page.url.rstrip('/') != self.course_url.rstrip('/'):
+            await page.goto(self.course_url, wait_until='domcontentloaded')
+        
+        # Ready as soon as the TOC (or the tab that reveals it) renders; networkidle
+        # would wait out the site's analytics beacons
+        try:
+            await page.wait_for_selector(f'{Config.LESSON_LINK_SELECTOR}, :text("Content")', timeout=30000)
+        except:
+            pass
+        
+        # Click on "Content" tab if it exists (to show TOC)
+        try:
+            print("   🔍  Looking for Content tab...")
+            content_btn = await page.wait_for_selector('text=Content', timeout=5000)
+            if content_btn:
+                await content_btn.click()
+                await page.wait_for_selector(Config.LESSON_LINK_SELECTOR, timeout=5000)
+                print("   ✓ Clicked Content tab")
+        except:
+            print("   ℹ️  Content tab not found, continuing...")
+        
+        # Click "Expand All" to reveal all sub-lessons
+        try:
+            print("   🔍 Looking for Expand All button...")
+            expand_btn = await page.wait_for_selector('text=Expand All', timeout=5000)
+            if expand_btn:
+                await expand_btn.click()
+                # Wait for the chapters to finish expanding: no DOM change for 300ms (max 2s)
+                await page.evaluate(_SETTLE_JS, {'idle': 300, 'max': 2000})
+                print("   ✓ Expanded all chapters")
+        except Exception as e:
+            print(f"   ⚠️  Could not click Expand All: {e}")
+            print("   Continuing anyway...")
+        
+        # Extract all lesson links using the specific class for lessons
+        print("   🔍 Extracting lesson URLs...")
+        return await page.evaluate("""
+            (selector) => {
+                // Get all lesson links (including sub-lessons)
+                const lessonLinks = Array.from(document.querySelectorAll(selector));
+                
+                // Extract unique URLs
+                const urls = [...new Set(lessonLinks.map(a => a.href))];
+                
+                // Filter to only include actual lesson pages (not the main course page)
+                const coursePath = window.location.pathname;
+                return urls.filter(url => 
+                    url.includes(coursePath) && 
+                    url !== window.location.href &&
+                    !url.endsWith(coursePath) &&
+                    !url.endsWith(coursePath + '/')
+                );
+            }
+        """, Config.LESSON_LINK_SELECTOR)
+    
     async def extract_lesson_urls(self, page: Page) -> List[str]:
         """Extract all lesson URLs from course"""
         try:
             print("📚 Extracting lesson URLs...")
-            await page.goto(self.course_url)
-            await page.wait_for_load_state('networkidle')
-            
-            # Click on "Content" tab if it exists (to show TOC)
-            try:
-                print("   🔍  Looking for Content tab...")
-                content_btn = await page.wait_for_selector('text=Content', timeout=5000)
-                if content_btn:
-                    await content_btn.click()
-                    await page.wait_for_timeout(1000)
-                    print("   ✓ Clicked Content tab")
-            except:
-                print("   ℹ️  Content tab not found, continuing...")
-            
-            # Click "Expand All" to reveal all sub-lessons
-            try:
-                print("   🔍 Looking for Expand All button...")
-                expand_btn = await page.wait_for_selector('text=Expand All', timeout=5000)
-                if expand_btn:
-                    await expand_btn.click()
-                    await page.wait_for_timeout(2000)  # Wait for all chapters to expand
-                    print("   ✓ Expanded all chapters")
-            except Exception as e:
-                print(f"   ⚠️  Could not click Expand All: {e}")
-                print("   Continuing anyway...")
-            
-            # Extract all lesson links using the specific class for lessons
-            print("   🔍 Extracting lesson URLs...")
-            links = await page.evaluate("""
-                () => {
-                    // Get all lesson links (including sub-lessons)
-                    const lessonLinks = Array.from(document.querySelectorAll('a.Lesson_lesson__uSC7b'));
-                    
-                    // Extract unique URLs
-                    const urls = [...new Set(lessonLinks.map(a => a.href))];
-                    
-                    // Filter to only include actual lesson pages (not the main course page)
-                    const coursePath = window.location.pathname;
-                    return urls.filter(url => 
-                        url.includes(coursePath) && 
-                        url !== window.location.href &&
-                        !url.endsWith(coursePath) &&
-                        !url.endsWith(coursePath + '/')
-                    );
-                }
-            """)
+            links = await self._lesson_urls_from_api(page)
+            if links:
+                print("   ✓ Read lesson list from the course API")
+            else:
+                links = await self._lesson_urls_from_dom(page)
             
             self.lesson_urls = links
             print(f"✓ Found {len(links)} lessons (including sub-lessons)")
@@ -213,260 +555,269 @@ class CourseDownloader:
             print(f"❌ URL extraction failed: {e}")
             return []
     
-    async def download_lesson_as_pdf_screenshots(self, url: str, lesson_num: int, semaphore: asyncio.Semaphore) -> Optional[Path]:
-        """
-        METHOD 1: Full-page screenshots → PDF (Most Reliable)
-        Captures EVERYTHING visible, no content loss possible
-        """
-        async with semaphore:
-            # Retry logic
-            for attempt in range(1, Config.MAX_RETRIES + 1):
-                context = None
-                page = None
+    async def _make_lesson_folder(self, page: Page, lesson_num: int) -> Tuple[str, Path]:
+        """Read the lesson title and create its folder in a worker thread"""
+        title = self._sanitize_filename((await page.title()).split('|')[0].strip())
+        lesson_folder = self.course_dir / f"{lesson_num:03d}_{title}"
+        await asyncio.to_thread(lesson_folder.mkdir, parents=True, exist_ok=True)
+        return title, lesson_folder
+    
+    async def _download_lesson(self, url: str, lesson_num: int, context: BrowserContext) -> Optional[Path]:
+        """Load a lesson fully (shared by both methods), then hand the page to the render step"""
+        # The worker's context is already authenticated; only the page is per lesson
+        # Retry logic
+        for attempt in range(1, Config.MAX_RETRIES + 1):
+            page = None
+            wait_time = 0
+            # Admitted per attempt, so a backoff sleep never holds a slot
+            async with self.admission:
                 try:
                     if attempt > 1:
                         print(f"[{lesson_num}]  Retry attempt {attempt}/{Config.MAX_RETRIES}")
                     else:
                         print(f"[{lesson_num}] 📥 Starting download: {url}")
                     
-                    # Use reasonable viewport size (not huge)
-                    if attempt == 1:
-                        print(f"[{lesson_num}] 🌐 Creating browser context...")
-                    context = await self.browser.new_context(viewport={'width': 1440, 'height': 900})
-                    
-                    # Use stored cookies (no file I/O)
-                    if self.cookies:
-                        await context.add_cookies(self.cookies)
-                        if attempt == 1:
-                            print(f"[{lesson_num}] 🍪 Cookies loaded")
-                    
-                    page = await context.new_page()
+                    page = await self._new_lesson_page(context)
+                    if not Config.SCREENSHOT_METHOD:
+                        # Lay the lesson out for print from the start, so lazy content resolves in the
+                        # layout page.pdf() uses and printing doesn't trigger a second full relayout
+                        await page.emulate_media(media='print')
                     if attempt == 1:
                         print(f"[{lesson_num}] 🔄 Navigating to page...")
-                    await page.goto(url, wait_until='domcontentloaded', timeout=100000)  # 100s
+                    response = await page.goto(url, wait_until='domcontentloaded')
+                    if response and response.status == 429:
+                        self.admission.throttled()
+                        retry_after = response.headers.get('retry-after', '')
+                        raise RateLimited(int(retry_after) if retry_after.isdigit() else None)
                     
                     # Wait for page to be fully loaded with all resources
                     print(f"[{lesson_num}] ⏳ Waiting for page and resources to load...")
-                    await page.wait_for_load_state('load', timeout=100000)  # 100s
+                    await page.wait_for_load_state('load')
                     
                     # Try to wait for networkidle, but don't fail if it times out
+                    # (this is the dynamic-content signal the old fixed 3s sleep stood in for)
                     try:
-                        await page.wait_for_load_state('networkidle', timeout=60000)  # 1 minute
+                        await page.wait_for_load_state('networkidle', timeout=15000)
                     except:
                         print(f"[{lesson_num}] ⚠️  Network still active (this is OK)")
                     
-                    await page.wait_for_timeout(3000)  # Extra 3s for dynamic content
                     print(f"[{lesson_num}] ✓ Page loaded")
                     
-                    # Wait for all images with extended timeout
+                    # Promote lazy media to eager so it all loads in parallel, then one frame-paced
+                    # pass for observer-gated widgets; pages without lazy media skip it entirely
+                    if await page.evaluate(_EAGER_LOAD_JS):
+                        print(f"[{lesson_num}] 📜 Eager-loaded lazy content")
+                    
+                    # One wait for every image (lazy ones included); broken images count as
+                    # complete, so they no longer hold the lesson for a per-image timeout
                     print(f"[{lesson_num}] 🖼️  Waiting for images to load...")
                     try:
-                        await page.evaluate("""
-                            async () => {
-                                // Wait for all images to load
-                                const images = Array.from(document.images);
-                                await Promise.all(
-                                    images.map(img => {
-                                        if (img.complete) return Promise.resolve();
-                                        return new Promise((resolve) => {
-                                            img.onload = resolve;
-                                            img.onerror = resolve;
-                                            // Timeout after 10s per image
-                                            setTimeout(resolve, 10000);
-                                        });
-                                    })
-                                );
-                            }
-                        """)
-                        await page.wait_for_timeout(2000)  # Extra 2s buffer
-                        print(f"[{lesson_num}] ✓ Images loaded")
+                        await page.wait_for_function(_IMAGES_READY_JS,
+                                                     timeout=15000, polling=100)
+                        print(f"[{lesson_num}] ✓ Content fully loaded")
                     except Exception as e:
                         print(f"[{lesson_num}] ⚠️  Image loading timeout (continuing anyway): {e}")
                     
-                    # Multiple scrolls to trigger ALL lazy-loading with longer waits
-                    print(f"[{lesson_num}] 📜 Scrolling to trigger lazy-loaded content...")
-                    total_height = await page.evaluate("document.body.scrollHeight")
-                    viewport_height = await page.evaluate("window.innerHeight")
-                    
-                    # Scroll more slowly with longer pauses to trigger lazy loading
-                    scroll_step = viewport_height // 3  # Smaller steps
-                    for scroll_pos in range(0, total_height, scroll_step):
-                        await page.evaluate(f"window.scrollTo(0, {scroll_pos})")
-                        await page.wait_for_timeout(1000)  # Increased from 500ms to 1s
-                    
-                    # Scroll back to top
-                    await page.evaluate("window.scrollTo(0, 0)")
-                    await page.wait_for_timeout(2000)
-                    
-                    # Final wait for any remaining lazy-loaded images
-                    print(f"[{lesson_num}] ⏳ Final wait for lazy-loaded media...")
-                    await page.wait_for_timeout(3000)  # Extended final wait
-                    print(f"[{lesson_num}] ✓ Content fully loaded")
-                    
-                    # Hide minimap if present (to avoid covering content)
-                    try:
-                        print(f"[{lesson_num}] 🗺️  Checking for minimap...")
-                        # Try to find and click the minimap button/toggle
-                        minimap_hidden = await page.evaluate("""
-                            () => {
-                                // Look for common minimap selectors
-                                const selectors = [
-                                    '[aria-label*="minimap" i]',
-                                    '[title*="minimap" i]',
-                                    'button[class*="minimap" i]',
-                                    '.minimap-toggle',
-                                    '[data-testid*="minimap" i]'
-                                ];
-                                
-                                for (const selector of selectors) {
-                                    const btn = document.querySelector(selector);
-                                    if (btn) {
-                                        btn.click();
-                                        return true;
-                                    }
-                                }
-                                return false;
-                            }
-                        """)
-                        if minimap_hidden:
-                            print(f"[{lesson_num}] ✓ Minimap hidden")
-                            await page.wait_for_timeout(500)  # Wait for UI to update
-                    except:
-                        pass  # Minimap not found or already hidden
-                    
-                    # Get title and create lesson folder
-                    title = await page.title()
-                    title = self._sanitize_filename(title.split('|')[0].strip())
-                    lesson_folder = self.course_dir / f"{lesson_num:03d}_{title}"
-                    lesson_folder.mkdir(parents=True, exist_ok=True)
-                    
-                    # Take full-page screenshot with increased timeout
-                    print(f"[{lesson_num}] 📸 Taking screenshot...")
-                    screenshot_path = lesson_folder / "page_full.png"
-                    await page.screenshot(path=str(screenshot_path), full_page=True, timeout=60000)  # 60s timeout
-                    print(f"[{lesson_num}] ✓ Screenshot saved ({screenshot_path.stat().st_size // 1024} KB)")
-                    
-                    # Convert screenshot to PDF
-                    print(f"[{lesson_num}] 📄 Converting to PDF...")
-                    pdf_path = lesson_folder / f"{title}.pdf"
-                    with open(pdf_path, 'wb') as f:
-                        f.write(img2pdf.convert(str(screenshot_path)))
-                    
-                    # Clean up screenshot
-                    screenshot_path.unlink()
-                    
-                    pdf_size_kb = pdf_path.stat().st_size // 1024
-                    print(f"✅ [{lesson_num}] {title}.pdf ({pdf_size_kb} KB)")
-                    print(f"    └─ {pdf_path}")
-                    
-                    await context.close()
-                    return pdf_path
+                    return await self._render(page, lesson_num)
                     
                 except Exception as e:
                     error_msg = str(e)
+                    self.admission.failed()
                     
-                    # Clean up resources
-                    if context:
-                        try:
-                            await context.close()
-                        except:
-                            pass
-                    
-                    # If this is not the last attempt, wait and retry
+                    # If this is not the last attempt, wait (after leaving admission) and retry
                     if attempt < Config.MAX_RETRIES:
-                        wait_time = attempt * 2  # Exponential backoff: 2s, 4s, 6s
+                        if isinstance(e, RateLimited):
+                            # Give the rate limiter real time to recover, or exactly what it asks for
+                            wait_time = e.retry_after or Config.RATE_LIMIT_BACKOFF * attempt
+                        else:
+                            wait_time = attempt * 2  # Linear backoff: 2s, 4s, 6s
                         print(f"⚠️  [{lesson_num}] Attempt {attempt} failed: {error_msg}")
                         print(f"    └─ Waiting {wait_time}s before retry...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    
-                    # Final failure after all retries
-                    print(f"❌ [{lesson_num}] FAILED after {Config.MAX_RETRIES} attempts: {error_msg}")
-                    print(f"    └─ URL: {url}")
+                    else:
+                        # Final failure after all retries
+                        print(f"❌ [{lesson_num}] FAILED after {Config.MAX_RETRIES} attempts: {error_msg}")
+                        print(f"    └─ URL: {url}")
                     
-                    # Try to save a debug screenshot
-                    try:
-                        if page:
-                            debug_path = self.course_dir / f"error_lesson_{lesson_num}.png"
-                            await page.screenshot(path=str(debug_path))
-                            print(f"    └─ Debug screenshot saved: {debug_path}")
-                    except:
-                        pass
+                        # Try to save a debug screenshot
+                        try:
+                            if page:
+                                debug_path = self.course_dir / f"error_lesson_{lesson_num}.png"
+                                await page.screenshot(path=str(debug_path))
+                                print(f"    └─ Debug screenshot saved: {debug_path}")
+                        except:
+                            pass
                     
-                    return None
-            
-            return None  # Should never reach here
+                        return None
+                finally:
+                    # Pages are per attempt; a failed one must not linger in the shared context
+                    if page and not page.is_closed():
+                        try:
+                            await page.close()
+                        except:
+                            pass
+            await asyncio.sleep(wait_time)
+        
+        return None  # Should never reach here
+    
+    async def _render_screenshot(self, page: Page, lesson_num: int) -> Path:
+        """
+        METHOD 1: Full-page screenshots → PDF (Most Reliable)
+        Captures EVERYTHING visible, no content loss possible
+        """
+        # Hide minimap if present (to avoid covering content) and measure the page in the same call
+        print(f"[{lesson_num}] 🗺️  Checking for minimap...")
+        minimap_hidden, total_height = await page.evaluate(_HIDE_MINIMAP_JS)
+        if minimap_hidden:
+            print(f"[{lesson_num}] ✓ Minimap hidden")
+        
+        title, lesson_folder = await self._make_lesson_folder(page, lesson_num)
+        
+        # Capture the page in horizontal tiles so the renderer never allocates
+        # one bitmap for the whole (possibly 20,000px) document
+        print(f"[{lesson_num}] 📸 Taking screenshot...")
+        width = page.viewport_size['width']
+        tile_height = Config.TILE_HEIGHT or page.viewport_size['height']
+        tiles = []
+        tiles_bytes = 0
+        for i, y in enumerate(range(0, total_height, tile_height)):
+            # JPEG encodes far faster than PNG and is embedded in the PDF as-is (no re-encode).
+            # With tmpfs the tile is parked there so a worker only holds one in memory;
+            # otherwise the bytes go straight to the PDF writer, never touching disk.
+            clip = {'x': 0, 'y': y, 'width': width, 'height': min(tile_height, total_height - y)}
+            shot = await page.screenshot(full_page=True, clip=clip, type='jpeg', quality=Config.JPEG_QUALITY)
+            tiles_bytes += len(shot)
+            if self.tile_dir:
+                tile_path = self.tile_dir / f"lesson_{lesson_num}_{i}.jpg"
+                tile_path.write_bytes(shot)
+                shot = tile_path
+            tiles.append(shot)
+        print(f"[{lesson_num}] ✓ Screenshot captured ({tiles_bytes // 1024} KB, {len(tiles)} tiles)")
+        
+        # Convert screenshot to PDF, one page per tile
+        print(f"[{lesson_num}] 📄 Converting to PDF...")
+        pdf_path = lesson_folder / f"{title}.pdf"
+        # Conversion and the multi-MB write run off the event loop so other
+        # workers keep driving their pages meanwhile
+        try:
+            pdf_size = await asyncio.to_thread(_write_tiles_pdf, tiles, pdf_path)
+        finally:
+            # The course PDF reads the JPEGs back from the lesson PDF, so the tmpfs copies go now
+            for tile in tiles:
+                if isinstance(tile, Path):
+                    tile.unlink(missing_ok=True)
+        
+        print(f"✅ [{lesson_num}] {title}.pdf ({pdf_size // 1024} KB)")
+        print(f"    └─ {pdf_path}")
+        return pdf_path
     
-    async def download_lesson_as_pdf_enhanced(self, url: str, lesson_num: int, semaphore: asyncio.Semaphore) -> Optional[Path]:
+    async def _render_pdf(self, page: Page, lesson_num: int) -> Path:
         """
         METHOD 2: Enhanced Playwright PDF (Fallback)
         Better than basic print, waits for everything
         """
-        async with semaphore:
-            context = None
-            try:
-                print(f"[{lesson_num}] Downloading (enhanced PDF): {url}")
-                
-                context = await self.browser.new_context()
-                
-                # Use stored cookies (no file I/O)
-                if self.cookies:
-                    await context.add_cookies(self.cookies)
-                
-                page = await context.new_page()
-                await page.goto(url, wait_until='domcontentloaded', timeout=60000)
-                # Wait for page to be fully loaded
-                await page.wait_for_load_state('load')
-                await page.wait_for_timeout(2000)
-                
-                # Enhanced content loading
-                await page.evaluate("""
-                    async () => {
-                        // Wait for images
-                        await Promise.all(Array.from(document.images)
-                            .filter(img => !img.complete)
-                            .map(img => new Promise(r => { img.onload = img.onerror = r; })));
-                        
-                        // Scroll to load lazy content
-                        const scrolls = 10;
-                        const delay = 300;
-                        for(let i = 0; i < scrolls; i++) {
-                            window.scrollTo(0, (document.body.scrollHeight / scrolls) * i);
-                            await new Promise(r => setTimeout(r, delay));
-                        }
-                        window.scrollTo(0, 0);
-                    }
-                """)
-                
-                await page.wait_for_timeout(2000)
-                
-                # Get title
-                title = await page.title()
-                title = self._sanitize_filename(title.split('|')[0].strip())
-                lesson_folder = self.course_dir / f"{lesson_num:03d}_{title}"
-                lesson_folder.mkdir(parents=True, exist_ok=True)
-                
-                pdf_path = lesson_folder / f"{title}.pdf"
-                
-                # Enhanced PDF settings
-                await page.pdf(
-                    path=str(pdf_path),
-                    format='Letter',
-                    print_background=True,
-                    margin={'top': '0.3in', 'bottom': '0.3in', 'left': '0.3in', 'right': '0.3in'},
-                    prefer_css_page_size=False,
-                    scale=0.9
-                )
-                
-                print(f"✓ [{lesson_num}] {title}.pdf")
-                await context.close()
-                return pdf_path
-                
-            except Exception as e:
-                print(f"✗ [{lesson_num}] Failed: {e}")
-                if context:
-                    await context.close()
-                return None
+        # Let the final layout paint (two animation frames) before printing
+        await page.evaluate("() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))")
+        
+        title, lesson_folder = await self._make_lesson_folder(page, lesson_num)
+        pdf_path = lesson_folder / f"{title}.pdf"
+        
+        # Enhanced PDF settings; the bytes are written off the event loop
+        pdf_bytes = await page.pdf(
+            format='Letter',
+            print_background=True,
+            margin={'top': '0.3in', 'bottom': '0.3in', 'left': '0.3in', 'right': '0.3in'},
+            prefer_css_page_size=False,
+            scale=0.9
+        )
+        await asyncio.to_thread(pdf_path.write_bytes, pdf_bytes)
+        
+        print(f"✅ [{lesson_num}] {title}.pdf")
+        return pdf_path
+    
+    async def _new_lesson_page(self, context: BrowserContext) -> Page:
+        """Open a page that never requests trackers, media (or, for page.pdf(), fonts)"""
+        page = await context.new_page()
+        # Blocked over CDP rather than context.route(), which would disable the HTTP cache
+        # that the persistent profile shares across workers and runs
+        cdp = await context.new_cdp_session(page)
+        await cdp.send('Network.enable')
+        await cdp.send('Network.setBlockedURLs', {'urls': self.blocked_urls})
+        return page
+    
+    async def _new_worker_context(self) -> BrowserContext:
+        """Create a download context with the saved login state applied at init"""
+        context = await self.browser.new_context(viewport=Config.VIEWPORT, device_scale_factor=Config.DEVICE_SCALE_FACTOR,
+                                                 storage_state=self.storage_state)
+        self._apply_timeouts(context)
+        return context
+    
+    async def _launch_download_browser(self, p: Playwright) -> None:
+        """Start the headless download browser: one persistent profile, or a plain browser for per-worker contexts"""
+        if not Config.PROFILE_DIR:
+            self.browser = await p.chromium.launch(headless=Config.HEADLESS, args=Config.BROWSER_ARGS)
+            return
+        
+        # Every worker shares the profile's HTTP cache, so the site's CSS/JS/fonts are fetched
+        # once per run (or not at all on re-runs) and the session lives in the profile itself
+        context = await p.chromium.launch_persistent_context(
+            str(Config.PROFILE_DIR), headless=Config.HEADLESS, args=Config.BROWSER_ARGS,
+            viewport=Config.VIEWPORT, device_scale_factor=Config.DEVICE_SCALE_FACTOR,
+        )
+        # Refresh the login once, in case this run logged in again
+        await context.add_cookies(self.storage_state['cookies'])
+        self._apply_timeouts(context)
+        self.shared_context = context
+    
+    async def _close_download_browser(self) -> None:
+        """Close whichever download browser is running"""
+        if self.shared_context:
+            await self.shared_context.close()
+            self.shared_context = None
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+    
+    def _load_finished_lessons(self) -> Dict[str, Path]:
+        """Lesson PDFs from earlier runs that are still on disk, keyed by URL"""
+        try:
+            saved = json.loads(self.lesson_map_file.read_text())
+        except (OSError, ValueError):
+            return {}
+        
+        finished = {}
+        for url, path in saved.items():
+            path = Path(path)
+            if path.is_file() and path.stat().st_size >= Config.MIN_PDF_BYTES:
+                finished[url] = path
+        return finished
+    
+    def _save_finished_lessons(self, finished: Dict[str, Path]) -> None:
+        """Record finished lesson PDFs so a re-run only fetches the rest"""
+        self.course_dir.mkdir(parents=True, exist_ok=True)
+        self.lesson_map_file.write_text(json.dumps({url: str(path) for url, path in finished.items()}, indent=2))
+    
+    async def _order_longest_first(self, pending: List[Tuple[int, str]],
+                                   context: BrowserContext) -> List[Tuple[int, str]]:
+        """Sort lessons by HTML size (HEAD content-length, a proxy for lesson weight), largest first"""
+        probes = asyncio.Semaphore(Config.MAX_WORKERS)
+        
+        async def weight(url: str) -> int:
+            async with probes:
+                try:
+                    response = await context.request.head(url)
+                except Exception:
+                    return 0
+                if not response.ok:
+                    if response.status == 429:
+                        self.admission.throttled()  # Probes count against the same rate limit
+                    return 0
+                return int(response.headers.get('content-length', 0))
+        
+        weights = await asyncio.gather(*[weight(url) for _, url in pending])
+        if not any(weights):
+            return pending  # Compressed/chunked responses carry no length; keep course order
+        # Stable sort: lessons without a size hint keep course order
+        return [item for _, item in sorted(zip(weights, pending), key=lambda pair: -pair[0])]
     
     async def download_all_lessons(self) -> List[Path]:
         """Download all lessons in parallel"""
@@ -477,37 +828,126 @@ class CourseDownloader:
         if not self.lesson_urls:
             return []
         
-        semaphore = asyncio.Semaphore(Config.MAX_WORKERS)
+        # Bounded producer/consumer: exactly MAX_WORKERS lessons in flight, no per-lesson tasks.
+        # Lessons finished by an earlier run are reused instead of queued.
+        finished = self._load_finished_lessons()
+        lessons: asyncio.Queue = asyncio.Queue()
+        results = {}
+        pending = []
+        for i, url in enumerate(self.lesson_urls, 1):
+            if url in finished:
+                results[i] = finished[url]
+            else:
+                pending.append((i, url))
+        if results:
+            print(f"⏭️  Skipping {len(results)} lessons already downloaded")
+        elif Config.SCREENSHOT_METHOD:
+            # Fresh screenshot run: grow the course PDF while lessons are still downloading,
+            # so no merge pass is left for the end (reused lessons may predate the JPEG-only
+            # lesson format, so resumed runs merge)
+            self.course_dir.mkdir(parents=True, exist_ok=True)
+            self.course_writer = _JpegPdfWriter(self.course_dir / f"{self.course_name}_COMPLETE.pdf")
+        append_lock = asyncio.Lock()  # One thread writing the course PDF at a time
         
-        # Choose method
-        download_method = (self.download_lesson_as_pdf_screenshots 
-                          if Config.SCREENSHOT_METHOD 
-                          else self.download_lesson_as_pdf_enhanced)
+        async def append_finished():
+            async with append_lock:
+                if not self.course_writer:
+                    return
+                try:
+                    await asyncio.to_thread(self._append_ready_lessons, results)
+                except Exception as e:
+                    print(f"⚠️  Course PDF append failed, will merge instead: {e}")
+                    self._discard_course_writer()
         
-        tasks = [download_method(url, i, semaphore) 
-                for i, url in enumerate(self.lesson_urls, 1)]
+        async def worker(context: BrowserContext):
+            while True:
+                try:
+                    i, url = lessons.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                # Each attempt is admitted separately (in _download_lesson), so a 429 shrinks
+                # the number in flight without tearing down contexts
+                results[i] = await self._download_lesson(url, i, context)
+                if results[i]:
+                    await self.admission.succeeded()
+                await append_finished()
         
-        pdf_files = await asyncio.gather(*tasks)
-        pdf_files = [f for f in pdf_files if f]
+        # Context pool: authenticated contexts opened together up front, each shared by up to
+        # PAGES_PER_CONTEXT workers for all their lessons (or the persistent profile for all)
+        n_workers = min(Config.MAX_WORKERS, len(pending))
+        self.admission = Admission(n_workers)
+        if self.shared_context:
+            contexts = [self.shared_context]
+        else:
+            n_contexts = -(-n_workers // Config.PAGES_PER_CONTEXT)
+            contexts = await asyncio.gather(*[self._new_worker_context() for _ in range(n_contexts)])
+        try:
+            # With more lessons than workers, start the heaviest first so none is left to run alone at the end
+            if Config.LONGEST_FIRST and len(pending) > n_workers:
+                pending = await self._order_longest_first(pending, contexts[0])
+            for item in pending:
+                lessons.put_nowait(item)
+            await asyncio.gather(*[worker(contexts[k % len(contexts)]) for k in range(n_workers)])
+            if self.course_writer and self.course_writer.pages:
+                await asyncio.to_thread(self._finish_course_pdf)
+        finally:
+            if self.course_writer:
+                # Interrupted, or no lesson succeeded: drop the partial (or empty) course PDF
+                self._discard_course_writer()
+            if not self.shared_context:
+                await asyncio.gather(*[context.close() for context in contexts], return_exceptions=True)
+            # Persist progress even when the run is cut short
+            finished.update({self.lesson_urls[i - 1]: path for i, path in results.items() if path})
+            self._save_finished_lessons(finished)
+        pdf_files = [results[i] for i in sorted(results) if results[i]]
         
         print(f"\n✓ Downloaded {len(pdf_files)}/{len(self.lesson_urls)} lessons")
         return pdf_files
     
+    def _append_ready_lessons(self, results: Dict[int, Optional[Path]]) -> None:
+        """Append finished lessons to the course PDF in course order, once every earlier lesson is done"""
+        # Lessons finishing early (e.g. longest-first) wait as lesson PDFs on disk, not as tiles in memory
+        while self.next_course_lesson in results:
+            lesson_pdf = results[self.next_course_lesson]
+            if lesson_pdf:
+                for jpeg in _pdf_jpegs(lesson_pdf):
+                    self.course_writer.add_page(jpeg)
+            self.next_course_lesson += 1
+    
+    def _finish_course_pdf(self) -> None:
+        """Close the incrementally written course PDF"""
+        self.course_writer.close()
+        self.course_pdf = Path(self.course_writer.f.name)
+        self.course_writer = None
+        print(f"\n✓ Merged: {self.course_pdf.name}")
+    
+    def _discard_course_writer(self) -> None:
+        """Abandon a partial course PDF"""
+        self.course_writer.f.close()
+        Path(self.course_writer.f.name).unlink(missing_ok=True)
+        self.course_writer = None
+    
     def merge_pdfs(self, pdf_files: List[Path]) -> Optional[Path]:
-        """Merge all PDFs into complete course"""
+        """Merge all PDFs into complete course (pdf_files must already be in lesson order)"""
         if not pdf_files:
             return None
         
         try:
             print("\n📚 Merging PDFs...")
-            merger = PdfMerger()
-            
-            for pdf in sorted(pdf_files):
-                merger.append(str(pdf))
-            
             output = self.course_dir / f"{self.course_name}_COMPLETE.pdf"
-            merger.write(str(output))
-            merger.close()
+            
+            # qpdf copies page objects natively; sources must stay open until the save.
+            # Opening is qpdf's per-file xref parsing, which releases the GIL, so the
+            # sources open in parallel threads and only the page appends run in order
+            with ExitStack() as stack, pikepdf.Pdf.new() as merged:
+                with ThreadPoolExecutor(max_workers=min(8, len(pdf_files))) as pool:
+                    sources = [stack.enter_context(src)
+                               for src in pool.map(pikepdf.open, pdf_files)]
+                for src in sources:
+                    merged.pages.extend(src.pages)
+                # Object streams pack the many small page/resource dicts; qpdf does this without recompressing images
+                merged.save(output, linearize=False, compress_streams=True,
+                            object_stream_mode=pikepdf.ObjectStreamMode.generate)
             
             print(f"✓ Merged: {output.name}")
             return output
@@ -515,41 +955,65 @@ class CourseDownloader:
             print(f"❌ Merge failed: {e}")
             return None
     
+    async def _open_auth_page(self, p: Playwright, headless: bool,
+                              saved_state: Optional[dict]) -> Tuple[Browser, BrowserContext, Page]:
+        """Launch the login browser with the saved session (if any) applied at context creation"""
+        browser = await p.chromium.launch(headless=headless, args=Config.BROWSER_ARGS + ['--window-size=1280,800'])
+        # Use reasonable viewport size
+        context = await browser.new_context(viewport={'width': 1280, 'height': 800}, storage_state=saved_state)
+        self._apply_timeouts(context)
+        return browser, context, await context.new_page()
+    
     async def run(self) -> bool:
         """Main execution"""
         async with async_playwright() as p:
             try:
-                self.browser = await p.chromium.launch(
-                    headless=False,
-                    args=['--disable-blink-features=AutomationControlled', '--window-size=1280,800']
-                )
-                
-                # Use reasonable viewport size
-                context = await self.browser.new_context(
-                    viewport={'width': 1280, 'height': 800}
-                )
-                page = await context.new_page()
-                
-                if not await self.authenticate(page):
-                    return False
-                
-                if not await self.extract_lesson_urls(page):
-                    return False
+                # Short-lived browser for login and lesson discovery; a (manual)
+                # login needs a visible window
+                saved_state = self._load_saved_state()
+                headless = Config.HEADLESS and saved_state is not None
+                auth_browser, context, page = await self._open_auth_page(p, headless, saved_state)
+                try:
+                    if saved_state is None or not await self._session_is_valid(page):
+                        if headless:
+                            # The saved session expired; log in again where the user can see it
+                            print("🔓 Reopening the browser for login...")
+                            await auth_browser.close()
+                            auth_browser, context, page = await self._open_auth_page(p, False, None)
+                        if not await self.authenticate(page):
+                            return False
+                    
+                    if not await self.extract_lesson_urls(page):
+                        return False
+                    
+                    # Snapshot cookies + local storage once for all worker contexts
+                    self.storage_state = await context.storage_state()
+                    self._save_json(Config.STATE_FILE, self.storage_state)
+                finally:
+                    await auth_browser.close()
                 
-                await context.close()
+                # Downloads run in their own browser, headless regardless of how login went
+                await self._launch_download_browser(p)
+                if Config.TILE_DIR:
+                    self.tile_dir = Path(tempfile.mkdtemp(prefix=f"{self.course_name}_tiles_", dir=Config.TILE_DIR))
                 
                 pdf_files = await self.download_all_lessons()
-                self.merge_pdfs(pdf_files)
+                # Chromium is done; free its memory before building the course PDF
+                await self._close_download_browser()
                 
-                await self.browser.close()
+                # Screenshot lessons were appended to the course PDF as they finished;
+                # otherwise (print-to-PDF, or a resumed run) merge the lesson PDFs, off the event loop
+                if not self.course_pdf:
+                    await asyncio.to_thread(self.merge_pdfs, pdf_files)
                 return True
                 
             except Exception as e:
                 print(f"❌ Error: {e}")
-                if self.browser:
-                    await self.browser.close()
+                await self._close_download_browser()
                 return False
-
+            finally:
+                if self.tile_dir:
+                    shutil.rmtree(self.tile_dir, ignore_errors=True)
 
 # ============================================================
 # MAIN EXECUTION
@@ -565,6 +1029,12 @@ if __name__ == '__main__':
     print(f"⚡ Workers: {Config.MAX_WORKERS}")
     print()
     
+    if UVLOOP_AVAILABLE:
+        import uvloop
+        run_async = uvloop.run
+    else:
+        run_async = asyncio.run
+    
     total_courses = len(COURSE_URLS)
     print(f"📚 Found {total_courses} courses to download")
     
@@ -575,7 +1045,7 @@ if __name__ == '__main__':
         print("="*70 + "\n")
         
         downloader = CourseDownloader(course_url)
-        success = asyncio.run(downloader.run())
+        success = run_async(downloader.run())
         
         if success:
             print("\n" + "="*70)